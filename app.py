@@ -1,6 +1,5 @@
-import pandas as pd
-
 import streamlit as st
+from core.bom_io import read_bom
 from core.report import generate_sanad_report, now_date_str
 from core.review import (
     climate_voltage_check,
@@ -9,11 +8,13 @@ from core.review import (
     saudi_standards_snapshot,
     try_extract_from_sld,
 )
+from core.gazetteer import all_places, place_label, search_places
 from core.stage2 import render_stage2
 from core.state import init_state, reset_all
 from core.theme import apply_theme
 from core.ui_components import header, render_map, weather_summary
-from core.weather import fetch_current_temp, fetch_design_tmin, geocode_list
+from core.uploads import upload_changed
+from core.weather import design_years, geocode_list, resolve_site_climate
 
 # Page config
 st.set_page_config(
@@ -52,6 +53,19 @@ def level_to_streamlit(level: str):
     return st.info
 
 
+def _apply_quick_pick():
+    label = st.session_state.get("geo_pick")
+    hits = [p for p in all_places() if place_label(p) == label]
+    if hits:
+        st.session_state["geo_results"] = hits
+
+
+def _local_search():
+    # answered from the local gazetteer, no Search click needed
+    hits = search_places((st.session_state.get("geo_query") or "").strip(), count=5)
+    if hits:
+        st.session_state["geo_results"] = hits
+
 
 if st.session_state["stage"] == 1:
     left, right = st.columns([1.05, 0.95], gap="large")
@@ -60,8 +74,21 @@ if st.session_state["stage"] == 1:
     with left:
         st.markdown('<div class="sg-h2">Site selection</div>', unsafe_allow_html=True)
 
+        # type-ahead over the local gazetteer (filtered in the browser)
+        st.selectbox(
+            "Quick pick (Saudi & GCC)",
+            [place_label(p) for p in all_places()],
+            index=None,
+            placeholder="Start typing a Saudi / GCC city…",
+            key="geo_pick",
+            on_change=_apply_quick_pick,
+        )
+
         q = st.text_input(
-            "Search (city / region)", placeholder="NEOM, Tabuk, Riyadh, Jeddah, Makkah"
+            "Search (city / region)",
+            placeholder="NEOM, Tabuk, Riyadh, Jeddah, Makkah",
+            key="geo_query",
+            on_change=_local_search,
         )
 
         a, b = st.columns([1, 1])
@@ -149,18 +176,23 @@ if st.session_state["stage"] == 1:
             st.session_state["lat"] = lat
             st.session_state["lon"] = lon
 
-            try:
-                st.session_state["current_temp"] = fetch_current_temp(lat, lon)
-            except Exception:
-                st.session_state["current_temp"] = None
-
-            try:
-                tmin, method = fetch_design_tmin(lat, lon, years=10)
-                st.session_state["tmin"] = tmin
-                st.session_state["tmin_method"] = method
-            except Exception:
-                st.session_state["tmin"] = None
-                st.session_state["tmin_method"] = "Archive: failed to derive Tmin"
+            st.session_state["current_temp"] = None
+            st.session_state["tmin"] = None
+            st.session_state["tmin_method"] = "Resolving site climate…"
+            st.session_state["climate_profile"] = None
+
+            # render each result as soon as it lands
+            live = st.empty()
+            for update in resolve_site_climate(lat, lon, years=design_years()):
+                st.session_state.update(update)
+                with live.container():
+                    weather_summary(
+                        place,
+                        st.session_state.get("current_temp"),
+                        st.session_state.get("tmin"),
+                        st.session_state.get("tmin_method"),
+                        years=design_years(),
+                    )
 
             st.rerun()
         st.markdown("</div>", unsafe_allow_html=True)
@@ -174,21 +206,28 @@ if st.session_state["stage"] == 1:
         sld = st.file_uploader("Single-Line Diagram (PDF)", type=["pdf"])
         bom = st.file_uploader("Bill of Materials (Excel)", type=["xlsx", "xls"])
 
-        if sld is not None:
+        # parse once per distinct upload, not on every rerun
+        if sld is not None and upload_changed(sld, "sld_fp"):
             st.session_state["sld_pdf_name"] = sld.name
             st.session_state["sld_pdf_bytes"] = sld.getvalue()
 
         if bom is not None:
-            st.session_state["bom_name"] = bom.name
-            try:
-                df = pd.read_excel(bom)
-                st.session_state["bom_df"] = df
+            if upload_changed(bom, "bom_fp"):
+                st.session_state["bom_name"] = bom.name
+                try:
+                    st.session_state["bom_df"] = read_bom(bom)
+                    st.session_state["bom_error"] = None
+                except Exception as e:
+                    st.session_state["bom_df"] = None
+                    st.session_state["bom_error"] = str(e)
+
+            df = st.session_state.get("bom_df")
+            if df is not None:
                 st.success("BoM loaded successfully.")
                 with st.expander("Preview (first 10 rows)"):
                     st.dataframe(df.head(10), use_container_width=True)
-            except Exception as e:
-                st.session_state["bom_df"] = None
-                st.error(f"Failed to read Excel: {e}")
+            else:
+                st.error(f"Failed to read Excel: {st.session_state.get('bom_error')}")
 
         st.markdown('<div class="sg-divider"></div>', unsafe_allow_html=True)
 
@@ -197,6 +236,7 @@ if st.session_state["stage"] == 1:
             st.session_state.get("current_temp"),
             st.session_state.get("tmin"),
             st.session_state.get("tmin_method"),
+            years=design_years(),
         )
 
         st.markdown("<br>", unsafe_allow_html=True)
@@ -0,0 +1,87 @@
+"""
+Compare PDF text backends on the synthetic SLD corpus.
+
+For every installed backend (or --backends ...): pages/sec for full text
+extraction (in process, best of --repeat runs) and signal recall, i.e.
+the share of planted SLD signals that core.sld_scan recovers with the
+right value from that backend's text.
+
+    python -m bench.pdf_backends [--backends pypdfium2 pypdf] [--repeat 3]
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+from bench.sld_corpus import build_corpus
+from core.pdf_backends import BACKENDS, available_backends, open_pdf
+from core.sld_scan import scan_pages
+
+
+def _extract_all(data: bytes, backend: str) -> List[str]:
+    n, page_text = open_pdf(data, backend)
+    return [page_text(i) for i in range(n)]
+
+
+def _matches(found, expected) -> bool:
+    if isinstance(expected, float) or isinstance(found, float):
+        try:
+            return abs(float(found) - float(expected)) < 1e-6
+        except (TypeError, ValueError):
+            return False
+    return found == expected
+
+
+def run(backends: List[str], repeat: int = 3, seed: int = 7) -> List[Dict]:
+    corpus = build_corpus(seed)
+    n_pages = sum(open_pdf(d, "pypdf2")[0] for _, d, _ in corpus)
+    n_signals = sum(len(t) for _, _, t in corpus)
+    rows = []
+    for backend in backends:
+        best = float("inf")
+        texts = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            texts = [_extract_all(d, backend) for _, d, _ in corpus]
+            best = min(best, time.perf_counter() - t0)
+
+        hits = wrong = 0
+        for (_, _, truth), pages in zip(corpus, texts):
+            found, _, _ = scan_pages(pages, targets=truth.keys())
+            for name, expected in truth.items():
+                if name not in found:
+                    continue
+                if _matches(found[name][0], expected):
+                    hits += 1
+                else:
+                    wrong += 1
+        rows.append(
+            {
+                "backend": backend,
+                "pages": n_pages,
+                "seconds": round(best, 3),
+                "pages_per_sec": round(n_pages / best, 1),
+                "recall": round(hits / n_signals, 3),
+                "wrong_values": wrong,
+            }
+        )
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--backends", nargs="*", choices=list(BACKENDS))
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    backends = args.backends or available_backends()
+    rows = run(backends, args.repeat, args.seed)
+    cols = list(rows[0]) if rows else []
+    print("  ".join(f"{c:>13}" for c in cols))
+    for r in sorted(rows, key=lambda r: (-r["recall"], -r["pages_per_sec"])):
+        print("  ".join(f"{r[c]!s:>13}" for c in cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Synthetic SLD corpus for the PDF backend benchmark.
+
+Deterministic (seeded) reportlab drawings: title block, equipment tags,
+cable labels, rotated text and label/value pairs laid out in separate
+columns, like exported CAD sheets. Target signals are placed on random
+pages with the phrasings seen on real drawings; the generator returns the
+ground truth with each document.
+
+    python -m bench.sld_corpus out_dir     # write PDFs + truth.json
+"""
+
+import io
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from reportlab.lib.pagesizes import A3, landscape
+from reportlab.pdfgen import canvas
+
+DOC_PAGES = [1, 2, 4, 8, 16, 30, 60, 120]
+
+# signal -> (value choices, phrasings); "{v}" is the value as printed
+TEMPLATES = {
+    "inverter_vmax": (
+        [1000, 1100, 1500],
+        [
+            "INVERTER DC MAX: {v} V",
+            "Vmax = {v} V",
+            "{v} V DC MAX",
+            "MAX DC {v}V",
+            "{v}VDC MAX",
+            "UDC MAX {v} V",
+        ],
+    ),
+    "modules_per_string": (
+        [18, 22, 24, 26, 28, 30],
+        [
+            "MODULES PER STRING: {v}",
+            "MPS {v}",
+            "String: {v} modules",
+            "Modules / String = {v}",
+        ],
+    ),
+    "strings_per_mppt": ([1, 2, 3], ["{v} strings per MPPT", "Strings/MPPT: {v}"]),
+    "mppt_count": ([2, 4, 6, 9, 12], ["No. of MPPT: {v}", "{v} MPPT"]),
+    "module_voc": ([41.2, 49.7, 50.3], ["Voc {v} V", "Voc (STC): {v} V"]),
+    "module_isc": ([13.9, 18.4], ["Isc {v} A"]),
+    "dc_cable_mm2": ([4, 6, 10], ["DC cable 1x{v} mm2 H1Z2Z2-K", "PV cable {v} sqmm"]),
+    "fuse_rating_a": ([15, 20, 25], ["String fuse {v} A gPV", "{v}A gPV fuse"]),
+    "breaker_rating_a": ([160, 250, 400], ["MCCB {v} A 3P", "{v}A MCCB"]),
+    "spd_type": (["2", "1+2"], ["SPD Type {v}", "Type {v} SPD"]),
+    "inverter_count": ([4, 10, 24], ["{v} x inverters", "No. of inverters: {v}"]),
+}
+
+
+def _expected(name: str, v):
+    if name == "spd_type":
+        return "+".join(f"T{d}" for d in sorted(set(str(v).replace("+", ""))))
+    return v
+
+
+def _filler(c: canvas.Canvas, rng: random.Random, w: float, h: float):
+    c.setFont("Helvetica", 7)
+    for _ in range(rng.randint(40, 90)):
+        x, y = rng.uniform(30, w - 120), rng.uniform(60, h - 40)
+        tag = rng.choice(
+            [
+                f"PV ARRAY {rng.choice('ABCD')}-{rng.randint(1, 40):02d}",
+                f"INV-{rng.randint(1, 30):02d}",
+                f"CB-{rng.randint(1, 12)}",
+                f"CABLE TAG W{rng.randint(100, 999)}",
+                f"JB-{rng.randint(1, 60):02d}",
+                "EARTH BAR",
+                "NOTE: ALL DIMENSIONS IN MM",
+            ]
+        )
+        if rng.random() < 0.2:
+            c.saveState()
+            c.translate(x, y)
+            c.rotate(90)
+            c.drawString(0, 0, tag)
+            c.restoreState()
+        else:
+            c.drawString(x, y, tag)
+        c.line(x, y - 2, x + rng.uniform(10, 80), y - 2)
+    # title block
+    c.setFont("Helvetica-Bold", 9)
+    c.drawString(w - 260, 40, "SINGLE LINE DIAGRAM - PV PLANT")
+    c.setFont("Helvetica", 7)
+    c.drawString(
+        w - 260, 28, f"DWG NO. SLD-{rng.randint(1000, 9999)}  REV {rng.randint(0, 5)}"
+    )
+
+
+def build_document(pages: int, rng: random.Random) -> Tuple[bytes, Dict]:
+    names = rng.sample(list(TEMPLATES), rng.randint(4, len(TEMPLATES)))
+    placed = {n: rng.randrange(pages) for n in names}
+    truth = {}
+    buf = io.BytesIO()
+    w, h = landscape(A3)
+    c = canvas.Canvas(buf, pagesize=(w, h))
+    for p in range(pages):
+        _filler(c, rng, w, h)
+        c.setFont("Helvetica", 8)
+        for name in [n for n, pg in placed.items() if pg == p]:
+            values, phrasings = TEMPLATES[name]
+            v = rng.choice(values)
+            text = rng.choice(phrasings).format(v=v)
+            x, y = rng.uniform(40, w - 300), rng.uniform(80, h - 60)
+            label, _, value = text.partition(": ")
+            if value and rng.random() < 0.5:
+                # label and value in separate table columns
+                c.drawString(x, y, label + ":")
+                c.drawString(x + 140, y, value)
+            else:
+                c.drawString(x, y, text)
+            truth[name] = _expected(name, v)
+        c.showPage()
+    c.save()
+    return buf.getvalue(), truth
+
+
+def build_corpus(seed: int = 7) -> List[Tuple[str, bytes, Dict]]:
+    rng = random.Random(seed)
+    return [
+        (f"sld_{i:02d}_{n}p.pdf", *build_document(n, rng))
+        for i, n in enumerate(DOC_PAGES)
+    ]
+
+
+def main():
+    out = Path(sys.argv[1] if len(sys.argv) > 1 else "bench/corpus")
+    out.mkdir(parents=True, exist_ok=True)
+    truth = {}
+    for name, data, t in build_corpus():
+        (out / name).write_bytes(data)
+        truth[name] = t
+    (out / "truth.json").write_text(json.dumps(truth, indent=2))
+    print(f"{len(truth)} documents written to {out}")
+
+
+if __name__ == "__main__":
+    main()
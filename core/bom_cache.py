@@ -0,0 +1,110 @@
+"""
+On-disk cache of parsed BoMs as Arrow IPC files, keyed by workbook content
+hash. Repeat loads are memory-mapped instead of re-parsing Excel. Files live
+under data_dir()/bom_cache; least recently used ones are evicted once the
+directory exceeds MAX_CACHE_BYTES. pyarrow is optional: without it every
+call is a no-op miss.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from core.paths import data_dir
+
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+# bump when core.bom_io / core.schema change what a parsed frame looks like
+CACHE_VERSION = "4"
+
+
+def _cache_dir() -> Path:
+    d = data_dir() / "bom_cache"
+    d.mkdir(exist_ok=True)
+    return d
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.ipc  # noqa: F401  # type: ignore
+    except ImportError:
+        return None
+    return pa
+
+
+def content_key(data: bytes, name: str = "") -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{CACHE_VERSION}:{os.path.splitext(name)[1].lower()}:".encode())
+    h.update(data)
+    return h.hexdigest()
+
+
+def cache_get(key: str) -> Optional[pd.DataFrame]:
+    pa = _pyarrow()
+    path = _cache_dir() / f"{key}.arrow"
+    if pa is None or not path.exists():
+        return None
+    try:
+        with pa.memory_map(str(path), "r") as src:
+            table = pa.ipc.open_file(src).read_all()
+        df = table.to_pandas()
+        meta = (table.schema.metadata or {}).get(b"sanad_attrs")
+        if meta:
+            df.attrs.update(json.loads(meta))
+        os.utime(path)  # mtime doubles as last-access time for LRU
+        return df
+    except (OSError, pa.ArrowException, ValueError):
+        return None
+
+
+def cache_put(key: str, df: pd.DataFrame, max_bytes: int = MAX_CACHE_BYTES):
+    pa = _pyarrow()
+    if pa is None:
+        return
+    d = _cache_dir()
+    path = d / f"{key}.arrow"
+    tmp = d / f"{key}.{os.getpid()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        meta = dict(table.schema.metadata or {})
+        meta[b"sanad_attrs"] = json.dumps(df.attrs).encode()
+        table = table.replace_schema_metadata(meta)
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)  # atomic: readers never see a partial file
+        _evict(d, keep=path, max_bytes=max_bytes)
+    except (OSError, pa.ArrowException, TypeError, ValueError):
+        tmp.unlink(missing_ok=True)
+
+
+def _evict(d: Path, keep: Path, max_bytes: int):
+    files = []
+    for p in d.glob("*.arrow"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, p))
+    total = sum(size for _, size, _ in files)
+    for _, size, p in sorted(files):
+        if total <= max_bytes:
+            break
+        if p == keep:
+            continue
+        p.unlink(missing_ok=True)
+        total -= size
+
+
+def cache_clear():
+    for p in _cache_dir().glob("*.arrow"):
+        p.unlink(missing_ok=True)
+
+
+def cache_info() -> dict:
+    files = list(_cache_dir().glob("*.arrow"))
+    return {"entries": len(files), "bytes": sum(p.stat().st_size for p in files)}
@@ -0,0 +1,188 @@
+"""
+BoM workbook ingestion.
+
+Reads only the header row first, resolves it with core.schema, then streams
+just the needed columns (calamine when installed, otherwise openpyxl in
+read-only mode) into a compact frame with canonical column names and
+downcast dtypes (small ints, categorical text). df.attrs["source_columns"]
+keeps the original headers. Every sheet is parsed in a worker process and
+sheets whose headers look like BoM data are merged, tagged with a "sheet"
+column. Parsed frames are cached by content hash.
+"""
+
+import io
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from core.bom_cache import cache_get, cache_put, content_key
+from core.schema import resolve_columns
+from core.workers import process_pool, reset_pool
+
+# a sheet must resolve at least this many BoM fields to be merged
+MIN_SHEET_SCORE = 2
+
+
+def _has_calamine() -> bool:
+    try:
+        import python_calamine  # noqa: F401  # type: ignore
+    except ImportError:
+        return False
+    return True
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    for c in df.columns:
+        s = df[c]
+        num = pd.to_numeric(s, errors="coerce")
+        if num.notna().sum() == s.notna().sum() and s.notna().any():
+            if num.notna().all() and (num % 1 == 0).all():
+                df[c] = pd.to_numeric(num, downcast="integer")
+            else:
+                # float32 would leak artefacts like 49.70000076 into the report
+                df[c] = num.astype("float64")
+        else:
+            # text or unit-bearing values ("49.5 V"); few distinct values per BoM
+            df[c] = s.map(str, na_action="ignore").astype("category")
+    return df
+
+
+def _finish(
+    df: pd.DataFrame, mapping: Dict[str, Optional[str]], sheet: Optional[str] = None
+) -> pd.DataFrame:
+    used = {f: c for f, c in mapping.items() if c is not None}
+    if used:
+        df = df.rename(columns={c: f for f, c in used.items()})
+    df = df.dropna(how="all").reset_index(drop=True)
+    df = _compact(df)
+    df.attrs["source_columns"] = used
+    df.attrs["sheet"] = sheet
+    return df
+
+
+def _score(mapping: Dict[str, Optional[str]]) -> int:
+    """BoM relevance of a sheet: how many schema fields its headers resolve."""
+    return sum(c is not None for c in mapping.values())
+
+
+def _read_openpyxl(data: bytes, sheet=0, min_score: int = 0) -> Optional[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return None
+        names = [
+            str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)
+        ]
+        mapping = resolve_columns(names)
+        if _score(mapping) < min_score:
+            return None
+        keep: List[int] = [names.index(c) for c in mapping.values() if c is not None]
+        if not keep:
+            keep = list(range(len(names)))
+        cols = {names[i]: [] for i in keep}
+        for r in rows:
+            for i in keep:
+                cols[names[i]].append(r[i] if i < len(r) else None)
+        return _finish(pd.DataFrame(cols), mapping, ws.title)
+    finally:
+        wb.close()
+
+
+def _read_pandas(
+    data: bytes, engine: Optional[str], sheet=0, min_score: int = 0
+) -> Optional[pd.DataFrame]:
+    header = pd.read_excel(io.BytesIO(data), engine=engine, sheet_name=sheet, nrows=0)
+    names = [str(c) for c in header.columns]
+    mapping = resolve_columns(names)
+    if _score(mapping) < min_score:
+        return None
+    wanted = [c for c in mapping.values() if c is not None]
+    df = pd.read_excel(
+        io.BytesIO(data), engine=engine, sheet_name=sheet, usecols=(wanted or None)
+    )
+    df.columns = [str(c) for c in df.columns]
+    return _finish(df, mapping, sheet if isinstance(sheet, str) else None)
+
+
+def _engine(name: str) -> Optional[str]:
+    if name.endswith(".xls"):
+        return None  # legacy format: pandas picks xlrd
+    if _has_calamine():
+        return "calamine"
+    return "openpyxl"
+
+
+def _read_sheet(data: bytes, name: str, sheet, min_score: int = 0):
+    """Parse one sheet (runs in a worker process); None when not BoM-like."""
+    engine = _engine(name)
+    if engine == "openpyxl":
+        return _read_openpyxl(data, sheet, min_score)
+    return _read_pandas(data, engine, sheet, min_score)
+
+
+def _merge(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """Stack BoM-like sheets on their canonical columns, tagging each row."""
+    used: Dict[str, str] = {}
+    for df in parts:
+        for f, c in df.attrs["source_columns"].items():
+            used.setdefault(f, f"{df.attrs['sheet']}!{c}")
+    df = pd.concat([p.assign(sheet=p.attrs["sheet"]) for p in parts], ignore_index=True)
+    df = _compact(df)
+    df.attrs["source_columns"] = used
+    df.attrs["sheets"] = [p.attrs["sheet"] for p in parts]
+    return df
+
+
+def _parse_parallel(data: bytes, name: str, sheets: List[str]) -> list:
+    pool = process_pool()
+    if pool is None:
+        return [_read_sheet(data, name, s, MIN_SHEET_SCORE) for s in sheets]
+    try:
+        futs = [
+            pool.submit(_read_sheet, data, name, s, MIN_SHEET_SCORE) for s in sheets
+        ]
+        return [f.result() for f in futs]
+    except BrokenProcessPool:
+        reset_pool(pool)
+    except OSError:
+        pass
+    return [_read_sheet(data, name, s, MIN_SHEET_SCORE) for s in sheets]
+
+
+def _parse(data: bytes, name: str) -> pd.DataFrame:
+    sheets = pd.ExcelFile(io.BytesIO(data), engine=_engine(name)).sheet_names
+    if len(sheets) <= 1:
+        return _read_sheet(data, name, 0)
+
+    parts = _parse_parallel(data, name, sheets)
+    parts = [p for p in parts if p is not None and not p.empty]
+    if not parts:
+        # nothing looks like a BoM: keep the first sheet as-is for the preview
+        return _read_sheet(data, name, 0)
+    if len(parts) == 1:
+        return parts[0]
+    return _merge(parts)
+
+
+def read_bom(file, name: Optional[str] = None, use_cache: bool = True) -> pd.DataFrame:
+    """
+    file: bytes or a file-like object (e.g. a Streamlit UploadedFile).
+    Parsed frames are cached on disk by content hash (core.bom_cache).
+    """
+    data = file if isinstance(file, (bytes, bytearray)) else file.getvalue()
+    name = (name or getattr(file, "name", "") or "").lower()
+    if not use_cache:
+        return _parse(data, name)
+
+    key = content_key(data, name)
+    df = cache_get(key)
+    if df is None:
+        df = _parse(data, name)
+        cache_put(key, df)
+    return df
@@ -0,0 +1,187 @@
+"""
+BoM validation.
+
+Coerces the numeric BoM fields column-at-a-time: values may carry units
+("49.5 V", "1.5 kV", "-0.29 %/°C", "-136 mV/°C"), decimal commas or a
+Unicode minus. Unparseable and out-of-range cells become NaN in the
+cleaned frame (so catalog values / defaults apply downstream) and are
+listed, one row per problem, in a compact issues table.
+"""
+
+import re
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.schema import resolve_columns
+
+# plausible ranges after unit conversion (temp_coeff as a magnitude, 1/°C)
+FIELD_LIMITS = {
+    "voc_stc": (5.0, 120.0),
+    "temp_coeff": (0.0005, 0.01),
+    "modules_per_string": (1, 60),
+    "inverter_vmax": (100.0, 2000.0),
+}
+
+_QUANTITY = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)\s*(.*?)\s*$")
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+
+ISSUE_COLUMNS = ["row", "sheet", "field", "value", "issue"]
+
+
+def _quantities(text: pd.Series) -> pd.DataFrame:
+    text = text.astype("string").str.strip().str.lower()
+    text = text.str.replace("−", "-", regex=False)  # Unicode minus
+    text = text.str.replace(_THOUSANDS, "", regex=True).str.replace(",", ".")
+    parts = text.str.extract(_QUANTITY)
+    return pd.DataFrame(
+        {
+            "value": pd.to_numeric(parts[0], errors="coerce").astype("float64"),
+            "unit": parts[1].fillna("").str.replace(" ", "").to_numpy(object),
+            "blank": (text.fillna("") == "").to_numpy(bool),
+        }
+    )
+
+
+def parse_quantity(s: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    Split cells into (number, lower-cased unit, blank mask). Text is parsed
+    once per distinct value (BoMs repeat the same few) and broadcast back;
+    numeric columns pass straight through.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        unit = pd.Series("", index=s.index, dtype="string")
+        return s.astype("float64"), unit, s.isna()
+
+    codes, uniques = pd.factorize(s)
+    parsed = _quantities(pd.Series(uniques, dtype=object))
+    # code -1 (missing) picks the appended blank row
+    parsed.loc[len(parsed)] = [np.nan, "", True]
+    picked = parsed.iloc[codes].set_axis(s.index)
+    return (
+        picked["value"].astype("float64"),
+        picked["unit"].astype("string"),
+        picked["blank"].astype(bool),
+    )
+
+
+def _volts(value: pd.Series, unit: pd.Series) -> pd.Series:
+    scale = np.select(
+        [
+            unit.str.startswith("kv").to_numpy(bool),
+            unit.str.startswith("mv").to_numpy(bool),
+        ],
+        [1000.0, 0.001],
+        1.0,
+    )
+    return value * scale
+
+
+def _coefficient(value: pd.Series, unit: pd.Series, voc: pd.Series) -> pd.Series:
+    """Relative Voc coefficient in 1/°C, from %/°C, mV/°C, V/°C or bare numbers."""
+    pct = unit.str.contains("%", regex=False).to_numpy(bool)
+    mv = unit.str.startswith("mv").to_numpy(bool)
+    v = unit.str.startswith("v").to_numpy(bool)
+    bare = ~(pct | mv | v)
+    out = np.where(pct, value / 100.0, value)
+    out = np.where(mv, value / 1000.0 / voc, out)  # absolute -> relative
+    out = np.where(v, value / voc, out)
+    # unit-less percent ("-0.29")
+    out = np.where(bare & (np.abs(value) > 0.05), value / 100.0, out)
+    return pd.Series(out, index=value.index, dtype="float64")
+
+
+def validate_bom(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns (cleaned frame, issues). The cleaned frame is a copy with the
+    resolved numeric columns as float64 and attrs["rejected"] (field ->
+    row labels masked to NaN); issues has ISSUE_COLUMNS.
+    Frames that already went through here are returned unchanged.
+    """
+    if df.attrs.get("validated"):
+        return df, pd.DataFrame(columns=ISSUE_COLUMNS)
+
+    cols = resolve_columns(df.columns)
+    out = df.copy()
+    parsed: Dict[str, pd.Series] = {}
+    units: Dict[str, pd.Series] = {}
+    blank: Dict[str, pd.Series] = {}
+    for field in FIELD_LIMITS:
+        if cols[field]:
+            parsed[field], units[field], blank[field] = parse_quantity(df[cols[field]])
+
+    issues = []
+    if "voc_stc" in parsed:
+        parsed["voc_stc"] = _volts(parsed["voc_stc"], units["voc_stc"])
+    if "inverter_vmax" in parsed:
+        parsed["inverter_vmax"] = _volts(
+            parsed["inverter_vmax"], units["inverter_vmax"]
+        )
+    if "temp_coeff" in parsed:
+        voc = parsed.get("voc_stc", pd.Series(np.nan, index=df.index))
+        tc = _coefficient(parsed["temp_coeff"], units["temp_coeff"], voc)
+        absolute = units["temp_coeff"].str.contains("v", regex=False).to_numpy(bool)
+        no_voc = (
+            pd.Series(absolute, index=df.index)
+            & tc.isna()
+            & parsed["temp_coeff"].notna()
+        )
+        issues.append(("temp_coeff", no_voc, "absolute coefficient without module Voc"))
+        parsed["temp_coeff"] = -tc.abs()  # Voc always falls with temperature
+
+    for field, (lo, hi) in FIELD_LIMITS.items():
+        if field not in parsed:
+            continue
+        value = parsed[field]
+        check = value.abs() if field == "temp_coeff" else value
+        issues.append((field, ~blank[field] & value.isna(), "not a number"))
+        issues.append(
+            (
+                field,
+                value.notna() & ((check < lo) | (check > hi)),
+                f"outside {lo:g}..{hi:g}",
+            )
+        )
+        if field == "modules_per_string":
+            issues.append(
+                (field, value.notna() & (value % 1 != 0), "not a whole number")
+            )
+
+    frames = []
+    rejected: Dict[str, set] = {}
+    for field, mask, text in issues:
+        mask = mask.fillna(False).to_numpy(bool)
+        if not mask.any():
+            continue
+        parsed[field] = parsed[field].mask(mask)
+        rejected.setdefault(field, set()).update(df.index[mask].tolist())
+        frames.append(
+            pd.DataFrame(
+                {
+                    "row": df.index[mask],
+                    "sheet": (
+                        df["sheet"][mask].astype("string").to_numpy()
+                        if "sheet" in df
+                        else pd.NA
+                    ),
+                    "field": field,
+                    "value": df[cols[field]][mask].astype("string").to_numpy(),
+                    "issue": text,
+                }
+            )
+        )
+
+    for field, values in parsed.items():
+        out[cols[field]] = values
+    out.attrs["validated"] = True
+    # row labels per field whose value was rejected (now NaN in the frame)
+    out.attrs["rejected"] = {f: sorted(rows) for f, rows in rejected.items()}
+
+    if frames:
+        report = pd.concat(frames, ignore_index=True)
+        report = report.drop_duplicates(["row", "field"]).sort_values(["row", "field"])
+        report = report.reset_index(drop=True)
+    else:
+        report = pd.DataFrame(columns=ISSUE_COLUMNS)
+    return out, report
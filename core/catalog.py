@@ -0,0 +1,257 @@
+"""
+Local module / inverter datasheet catalog (SQLite).
+
+Rows are keyed by a normalized model name. The whole catalog is mirrored
+in memory once per process, with an exact-key dict and a trigram index
+for fuzzy matches (IDF-weighted, results memoized per key), so a BoM row
+lookup is sub-millisecond. The mirror is reloaded when the database file
+changes.
+
+Populate it from CSV exports of manufacturer datasheets:
+
+    python -m core.catalog modules modules.csv
+    python -m core.catalog inverters inverters.csv
+"""
+
+import argparse
+import csv
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+from core.paths import data_dir
+
+TABLES = {
+    "modules": [
+        "model",
+        "manufacturer",
+        "voc_stc",
+        "isc_stc",
+        "vmp_stc",
+        "imp_stc",
+        "pmax_w",
+        "temp_coeff_voc",
+        "temp_coeff_vmp",
+    ],
+    "inverters": [
+        "model",
+        "manufacturer",
+        "vdc_max",
+        "mppt_vmin",
+        "mppt_vmax",
+        "mppt_count",
+        "idc_max",
+    ],
+}
+
+FUZZY_MIN_SCORE = 0.82
+# candidates ranked by edit similarity after the trigram shortlist
+FUZZY_SHORTLIST = 32
+# trigrams in more rows than this are skipped when shortlisting (they carry
+# almost no IDF weight and dominate the cost: "JKM", "72H", ...)
+COMMON_GRAM_ROWS = 512
+MEMO_MAX = 4096
+
+_lock = threading.Lock()
+_mirror: Dict[str, Dict] = {}
+
+
+def catalog_path() -> str:
+    return os.environ.get("SANAD_CATALOG_DB") or str(data_dir() / "datasheets.sqlite3")
+
+
+def catalog_version() -> str:
+    """Changes whenever the database file does (e.g. after an import)."""
+    try:
+        stat = os.stat(catalog_path())
+    except OSError:
+        return "none"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def normalize_model(s: str) -> str:
+    # "JKM580N-72HL4-V " -> "JKM580N72HL4V"
+    return re.sub(r"[^0-9A-Z]", "", str(s).upper())
+
+
+def _digit_runs(key: str) -> List[str]:
+    return re.findall(r"\d+", key)
+
+
+def _same_rating(a: str, b: str) -> bool:
+    # numbers carry the power class / voltage rating: one list must prefix the
+    # other; only the last compared run may lose a digit to a typo (B1234/B123Q)
+    ra, rb = _digit_runs(a), _digit_runs(b)
+    n = min(len(ra), len(rb))
+    if n == 0 or ra[: n - 1] != rb[: n - 1]:
+        return n == 0
+    x, y = sorted((ra[n - 1], rb[n - 1]), key=len)
+    return x == y or (len(y) - len(x) == 1 and y.startswith(x))
+
+
+def _trigrams(key: str) -> List[str]:
+    k = f"  {key} "
+    return [k[i : i + 3] for i in range(len(k) - 2)]
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(catalog_path(), timeout=10)
+    for table, cols in TABLES.items():
+        defs = ", ".join(
+            f"{c} TEXT" if c in ("model", "manufacturer") else f"{c} REAL" for c in cols
+        )
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(model_key TEXT PRIMARY KEY, {defs}) WITHOUT ROWID"
+        )
+    return conn
+
+
+def _load(table: str) -> Dict:
+    path = catalog_path()
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    with _lock:
+        cached = _mirror.get(table)
+        if cached is not None and cached["mtime"] == mtime:
+            return cached
+        rows: Dict[str, Dict] = {}
+        grams: Dict[str, List[str]] = {}
+        if mtime is not None:
+            conn = _connect()
+            try:
+                cur = conn.execute(f"SELECT * FROM {table}")
+                names = [d[0] for d in cur.description]
+                for r in cur:
+                    row = dict(zip(names, r))
+                    rows[row["model_key"]] = row
+                    for g in set(_trigrams(row["model_key"])):
+                        grams.setdefault(g, []).append(row["model_key"])
+            finally:
+                conn.close()
+        n = len(rows)
+        idf = {g: math.log(1.0 + n / len(keys)) for g, keys in grams.items()}
+        # fuzzy results per normalized key, dropped with the mirror
+        cached = {"mtime": mtime, "rows": rows, "grams": grams, "idf": idf, "memo": {}}
+        _mirror[table] = cached
+        return cached
+
+
+def _lookup(table: str, model: str) -> Optional[Dict]:
+    key = normalize_model(model)
+    if not key:
+        return None
+    idx = _load(table)
+    row = idx["rows"].get(key)
+    if row is not None:
+        return dict(row, match="exact", score=1.0)
+
+    memo = idx["memo"]
+    if key not in memo:
+        if len(memo) >= MEMO_MAX:
+            memo.clear()
+        memo[key] = _fuzzy(idx, key)
+    best, score = memo[key]
+    if best is None:
+        return None
+    return dict(idx["rows"][best], match="fuzzy", score=score)
+
+
+def _fuzzy(idx: Dict, key: str):
+    # shortlist by IDF-weighted shared trigrams (rare ones only, unless the
+    # key has nothing else), then rank by edit similarity
+    grams = [g for g in set(_trigrams(key)) if g in idx["grams"]]
+    rare = [g for g in grams if len(idx["grams"][g]) <= COMMON_GRAM_ROWS]
+    hits = Counter()
+    for g in rare or grams:
+        w = idx["idf"][g]
+        for cand in idx["grams"][g]:
+            hits[cand] += w
+    # lengths outside this range cannot reach FUZZY_MIN_SCORE: keep the
+    # shortlist for candidates that can
+    s = FUZZY_MIN_SCORE
+    lo, hi = len(key) * s / (2.0 - s), len(key) * (2.0 - s) / s
+    fits = (c for c in hits if lo <= len(c) <= hi)
+    best, best_score = None, 0.0
+    for cand in heapq.nlargest(FUZZY_SHORTLIST, fits, key=hits.__getitem__):
+        if not _same_rating(key, cand):
+            continue
+        sm = SequenceMatcher(None, key, cand)
+        bar = max(best_score, FUZZY_MIN_SCORE)
+        if sm.real_quick_ratio() < bar or sm.quick_ratio() < bar:
+            continue
+        score = sm.ratio()
+        if score > best_score:
+            best, best_score = cand, score
+    if best_score < FUZZY_MIN_SCORE:
+        return None, 0.0
+    return best, round(best_score, 3)
+
+
+def lookup_module(model: str) -> Optional[Dict]:
+    try:
+        return _lookup("modules", model)
+    except sqlite3.Error:
+        return None
+
+
+def lookup_inverter(model: str) -> Optional[Dict]:
+    try:
+        return _lookup("inverters", model)
+    except sqlite3.Error:
+        return None
+
+
+def all_inverters() -> List[Dict]:
+    """Every catalog inverter row (for catalog-wide string sizing)."""
+    try:
+        return list(_load("inverters")["rows"].values())
+    except sqlite3.Error:
+        return []
+
+
+def import_csv(table: str, path: str) -> int:
+    """Upsert datasheet rows from a CSV whose headers match TABLES[table]."""
+    cols = TABLES[table]
+    n = 0
+    conn = _connect()
+    try:
+        with conn, open(path, "r", encoding="utf-8-sig") as f:
+            for rec in csv.DictReader(f):
+                rec = {k.strip().lower(): v for k, v in rec.items() if k}
+                if not (rec.get("model") or "").strip():
+                    continue
+                vals = []
+                for c in cols:
+                    v = (rec.get(c) or "").strip()
+                    if c in ("model", "manufacturer"):
+                        vals.append(v or None)
+                    else:
+                        vals.append(float(v) if v else None)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {table} (model_key, {', '.join(cols)}) "
+                    f"VALUES ({', '.join('?' * (len(cols) + 1))})",
+                    [normalize_model(rec["model"])] + vals,
+                )
+                n += 1
+    finally:
+        conn.close()
+    return n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Import datasheets into the catalog.")
+    ap.add_argument("table", choices=sorted(TABLES))
+    ap.add_argument("csv_path")
+    args = ap.parse_args(argv)
+    n = import_csv(args.table, args.csv_path)
+    print(f"Imported {n} {args.table} into {catalog_path()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.paths import data_dir
+
+# ~5.5 km grid cells: sites in the same cell share one archive-derived Tmin
+GRID_STEP_DEG = 0.05
+TTL_SECONDS = 30 * 24 * 3600
+MAX_ENTRIES = 20000
+MAX_BLOB_BYTES = 256 * 1024 * 1024
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """One connection per thread; WAL lets sessions and processes share the file."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(str(data_dir() / "climate_cache.sqlite3"), timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tmin_cache (
+                key TEXT PRIMARY KEY,
+                value REAL NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS tmin_cache_accessed ON tmin_cache(accessed);
+            CREATE TABLE IF NOT EXISTS daily_tmin (
+                cell TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                tmin REAL NOT NULL,
+                PRIMARY KEY (cell, day)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS daily_sites (
+                cell TEXT PRIMARY KEY,
+                lat REAL NOT NULL,
+                lon REAL NOT NULL,
+                first_day INTEGER NOT NULL,
+                refreshed REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS site_climate (
+                id INTEGER PRIMARY KEY,
+                cell_i INTEGER NOT NULL,
+                cell_j INTEGER NOT NULL,
+                lat REAL NOT NULL,
+                lon REAL NOT NULL,
+                elevation REAL,
+                years INTEGER NOT NULL,
+                percentile REAL NOT NULL,
+                value REAL NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS site_climate_cell
+                ON site_climate(cell_i, cell_j, years, percentile);
+            CREATE TABLE IF NOT EXISTS blob_cache (
+                key TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        _local.conn = conn
+    return conn
+
+
+def grid_cell(lat: float, lon: float, step: float = GRID_STEP_DEG) -> Tuple[int, int]:
+    return round(float(lat) / step), round(float(lon) / step)
+
+
+def cell_id(lat: float, lon: float) -> str:
+    i, j = grid_cell(lat, lon)
+    return f"{GRID_STEP_DEG:g}:{i}:{j}"
+
+
+def tmin_key(lat: float, lon: float, years: int, percentile: float) -> str:
+    return f"{cell_id(lat, lon)}|{int(years)}y|p{float(percentile):g}"
+
+
+def _bump(conn: sqlite3.Connection, name: str):
+    conn.execute(
+        "INSERT INTO cache_stats(name, value) VALUES(?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+        (name,),
+    )
+
+
+def cache_get(key: str, ttl: float = TTL_SECONDS) -> Optional[float]:
+    try:
+        return _cache_get(key, ttl)
+    except sqlite3.Error:
+        # cache is an accelerator only; never fail a site setup because of it
+        return None
+
+
+def _cache_get(key: str, ttl: float) -> Optional[float]:
+    conn = _connect()
+    now = time.time()
+    with conn:
+        row = conn.execute(
+            "SELECT value, created FROM tmin_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (now - row[1]) > ttl:
+            _bump(conn, "miss")
+            return None
+        conn.execute("UPDATE tmin_cache SET accessed = ? WHERE key = ?", (now, key))
+        _bump(conn, "hit")
+    return float(row[0])
+
+
+def cache_put(key: str, value: float, max_entries: int = MAX_ENTRIES):
+    try:
+        _cache_put(key, value, max_entries)
+    except sqlite3.Error:
+        pass
+
+
+def _cache_put(key: str, value: float, max_entries: int):
+    conn = _connect()
+    now = time.time()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO tmin_cache(key, value, created, accessed) "
+            "VALUES(?, ?, ?, ?)",
+            (key, float(value), now, now),
+        )
+        conn.execute("DELETE FROM tmin_cache WHERE created < ?", (now - TTL_SECONDS,))
+        # size bound: drop least recently used rows beyond max_entries
+        conn.execute(
+            "DELETE FROM tmin_cache WHERE key IN ("
+            "SELECT key FROM tmin_cache ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (int(max_entries),),
+        )
+
+
+def cache_stats() -> Dict[str, int]:
+    conn = _connect()
+    stats = dict(conn.execute("SELECT name, value FROM cache_stats").fetchall())
+    stats.setdefault("hit", 0)
+    stats.setdefault("miss", 0)
+    stats["entries"] = conn.execute("SELECT COUNT(*) FROM tmin_cache").fetchone()[0]
+    return stats
+
+
+# Raw daily Tmin per grid cell, so refreshes only download the missing days.
+# Days are stored as proleptic ordinals (date.toordinal()).
+
+
+def series_range(cell: str) -> Optional[Tuple[int, int]]:
+    conn = _connect()
+    row = conn.execute(
+        "SELECT first_day FROM daily_sites WHERE cell = ?", (cell,)
+    ).fetchone()
+    if row is None:
+        return None
+    # last stored value, so days the archive had not published yet are retried
+    last = conn.execute(
+        "SELECT MAX(day) FROM daily_tmin WHERE cell = ?", (cell,)
+    ).fetchone()[0]
+    return int(row[0]), int(last if last is not None else row[0] - 1)
+
+
+def series_put(
+    cell: str,
+    lat: float,
+    lon: float,
+    days: Sequence[int],
+    values: Sequence[float],
+    first_day: int,
+):
+    """Store fetched days; first_day is the earliest day requested for the cell."""
+    conn = _connect()
+    rows = [(cell, int(d), float(v)) for d, v in zip(days, values) if v is not None]
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO daily_tmin(cell, day, tmin) VALUES(?, ?, ?)", rows
+        )
+        conn.execute(
+            "INSERT INTO daily_sites(cell, lat, lon, first_day, refreshed) "
+            "VALUES(?, ?, ?, ?, ?) ON CONFLICT(cell) DO UPDATE SET "
+            "first_day = MIN(first_day, excluded.first_day), "
+            "refreshed = excluded.refreshed",
+            (cell, float(lat), float(lon), int(first_day), time.time()),
+        )
+
+
+def series_values(cell: str, first_day: int, last_day: int) -> List[float]:
+    rows = _connect().execute(
+        "SELECT tmin FROM daily_tmin WHERE cell = ? AND day BETWEEN ? AND ?",
+        (cell, int(first_day), int(last_day)),
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def series_sites() -> List[Tuple[str, float, float]]:
+    """(cell, lat, lon) for every site with a stored daily series."""
+    return [
+        (r[0], float(r[1]), float(r[2]))
+        for r in _connect().execute("SELECT cell, lat, lon FROM daily_sites")
+    ]
+
+
+# Every resolved site climate, indexed by grid cell so nearby sites can reuse
+# a neighbour's value instead of downloading the archive again.
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+def site_put(
+    lat: float,
+    lon: float,
+    elevation: Optional[float],
+    years: int,
+    percentile: float,
+    value: float,
+    max_entries: int = MAX_ENTRIES,
+):
+    i, j = grid_cell(lat, lon)
+    conn = _connect()
+    now = time.time()
+    with conn:
+        conn.execute(
+            "INSERT INTO site_climate(cell_i, cell_j, lat, lon, elevation, years, "
+            "percentile, value, created) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                i,
+                j,
+                float(lat),
+                float(lon),
+                elevation,
+                int(years),
+                float(percentile),
+                float(value),
+                now,
+            ),
+        )
+        conn.execute(
+            "DELETE FROM site_climate WHERE id IN ("
+            "SELECT id FROM site_climate ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (int(max_entries),),
+        )
+
+
+def site_neighbours(
+    lat: float,
+    lon: float,
+    years: int,
+    percentile: float,
+    radius_km: float,
+    ttl: float = TTL_SECONDS,
+) -> List[Dict]:
+    """Resolved sites within radius_km, nearest first (each with distance_km)."""
+    i, j = grid_cell(lat, lon)
+    cell_km = 111.32 * GRID_STEP_DEG
+    di = int(math.ceil(radius_km / cell_km))
+    dj = int(math.ceil(radius_km / (cell_km * max(math.cos(math.radians(lat)), 0.01))))
+    rows = (
+        _connect()
+        .execute(
+            "SELECT lat, lon, elevation, value FROM site_climate "
+            "WHERE cell_i BETWEEN ? AND ? AND cell_j BETWEEN ? AND ? "
+            "AND years = ? AND percentile = ? AND created >= ?",
+            (
+                i - di,
+                i + di,
+                j - dj,
+                j + dj,
+                int(years),
+                float(percentile),
+                time.time() - ttl,
+            ),
+        )
+        .fetchall()
+    )
+    out = []
+    for nlat, nlon, elev, value in rows:
+        d = haversine_km(lat, lon, nlat, nlon)
+        if d <= radius_km:
+            out.append(
+                {
+                    "lat": nlat,
+                    "lon": nlon,
+                    "elevation": elev,
+                    "value": value,
+                    "distance_km": d,
+                }
+            )
+    out.sort(key=lambda r: r["distance_km"])
+    return out
+
+
+# Serialized objects (e.g. climate profiles), bounded by total size.
+
+
+def blob_get(key: str, ttl: float = TTL_SECONDS) -> Optional[bytes]:
+    try:
+        conn = _connect()
+        now = time.time()
+        with conn:
+            row = conn.execute(
+                "SELECT data, created FROM blob_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (now - row[1]) > ttl:
+                _bump(conn, "blob_miss")
+                return None
+            conn.execute("UPDATE blob_cache SET accessed = ? WHERE key = ?", (now, key))
+            _bump(conn, "blob_hit")
+        return bytes(row[0])
+    except sqlite3.Error:
+        return None
+
+
+def blob_put(key: str, data: bytes, max_bytes: int = MAX_BLOB_BYTES):
+    try:
+        conn = _connect()
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO blob_cache(key, data, size, created, accessed) "
+                "VALUES(?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), len(data), now, now),
+            )
+            # evict least recently used blobs until under the byte budget
+            total = conn.execute("SELECT SUM(size) FROM blob_cache").fetchone()[0] or 0
+            for k, size in conn.execute(
+                "SELECT key, size FROM blob_cache ORDER BY accessed ASC"
+            ).fetchall():
+                if total <= max_bytes or k == key:
+                    break
+                conn.execute("DELETE FROM blob_cache WHERE key = ?", (k,))
+                total -= size
+    except sqlite3.Error:
+        pass
@@ -0,0 +1,149 @@
+"""
+Offline design-Tmin raster for air-gapped review machines.
+
+Build once on a connected machine (resumable: every node goes through the
+on-disk archive cache), then copy the SANAD data directory across:
+
+    python -m core.climate_grid --bbox 16.0 34.5 32.5 56.0 --step 0.25
+
+Lookups memory-map the .npy file and bilinearly interpolate the four
+surrounding nodes, so each query is constant time with no network call.
+"""
+import argparse
+import json
+import math
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from core.paths import data_dir
+
+# Kingdom of Saudi Arabia (lat_min, lon_min, lat_max, lon_max)
+KSA_BBOX = (16.0, 34.5, 32.5, 56.0)
+
+
+def _grid_paths(years: int, percentile: float) -> Tuple[str, str]:
+    stem = data_dir() / f"tmin_grid_{int(years)}y_p{float(percentile):g}"
+    return str(stem) + ".npy", str(stem) + ".json"
+
+
+@lru_cache(maxsize=8)
+def load_grid(years: int = 10, percentile: float = 0.01):
+    """(memory-mapped array, meta) for the grid, or None if it was never built."""
+    npy_path, meta_path = _grid_paths(years, percentile)
+    if not (os.path.exists(npy_path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return np.load(npy_path, mmap_mode="r"), meta
+
+
+def grid_lookup(
+    lat: float, lon: float, years: int = 10, percentile: float = 0.01
+) -> Optional[float]:
+    """Bilinear interpolation of the raw Tmin percentile; None outside coverage."""
+    loaded = load_grid(int(years), float(percentile))
+    if loaded is None:
+        return None
+    grid, meta = loaded
+    step = float(meta["step"])
+    nlat, nlon = grid.shape
+
+    y = (float(lat) - float(meta["lat0"])) / step
+    x = (float(lon) - float(meta["lon0"])) / step
+    if not (0.0 <= y <= nlat - 1 and 0.0 <= x <= nlon - 1):
+        return None
+
+    i0 = min(int(y), max(nlat - 2, 0))
+    j0 = min(int(x), max(nlon - 2, 0))
+    i1, j1 = min(i0 + 1, nlat - 1), min(j0 + 1, nlon - 1)
+    fy, fx = y - i0, x - j0
+
+    corners = np.array(
+        [grid[i0, j0], grid[i0, j1], grid[i1, j0], grid[i1, j1]], dtype="float64"
+    )
+    weights = np.array(
+        [(1 - fy) * (1 - fx), (1 - fy) * fx, fy * (1 - fx), fy * fx], dtype="float64"
+    )
+    # nodes the builder could not resolve are NaN: renormalize over the rest
+    ok = ~np.isnan(corners)
+    if not ok.any() or weights[ok].sum() <= 0:
+        return None
+    return float((corners[ok] * weights[ok]).sum() / weights[ok].sum())
+
+
+def build_grid(
+    bbox: Tuple[float, float, float, float] = KSA_BBOX,
+    step: float = 0.25,
+    years: int = 10,
+    percentile: float = 0.01,
+    progress: bool = False,
+) -> Dict:
+    from core.weather import archive_tmin_percentile
+
+    lat_min, lon_min, lat_max, lon_max = bbox
+    nlat = int(math.floor((lat_max - lat_min) / step + 1e-9)) + 1
+    nlon = int(math.floor((lon_max - lon_min) / step + 1e-9)) + 1
+
+    npy_path, meta_path = _grid_paths(years, percentile)
+    tmp_path = npy_path + ".tmp.npy"
+    grid = np.lib.format.open_memmap(
+        tmp_path, mode="w+", dtype="float32", shape=(nlat, nlon)
+    )
+    missing = 0
+    for i in range(nlat):
+        for j in range(nlon):
+            try:
+                p, _ = archive_tmin_percentile(
+                    lat_min + i * step, lon_min + j * step, years, percentile
+                )
+            except Exception:
+                p = None
+            if p is None:
+                missing += 1
+            grid[i, j] = np.nan if p is None else p
+        grid.flush()
+        if progress:
+            print(f"row {i + 1}/{nlat} done ({missing} missing nodes)")
+    del grid
+
+    meta = {
+        "lat0": lat_min,
+        "lon0": lon_min,
+        "step": step,
+        "shape": [nlat, nlon],
+        "years": years,
+        "percentile": percentile,
+        "missing_nodes": missing,
+    }
+    os.replace(tmp_path, npy_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    load_grid.cache_clear()
+    return meta
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the offline design-Tmin grid.")
+    ap.add_argument(
+        "--bbox",
+        nargs=4,
+        type=float,
+        default=list(KSA_BBOX),
+        metavar=("LAT_MIN", "LON_MIN", "LAT_MAX", "LON_MAX"),
+    )
+    ap.add_argument("--step", type=float, default=0.25, help="node spacing (deg)")
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--percentile", type=float, default=0.01)
+    args = ap.parse_args(argv)
+
+    meta = build_grid(
+        tuple(args.bbox), args.step, args.years, args.percentile, progress=True
+    )
+    print(json.dumps(meta, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Site climate profile: everything the review checks need from the archive,
+fetched once as combined daily + hourly requests (one per year chunk,
+all variables together) and summarized in a single vectorized pass.
+"""
+
+import io
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DAILY_VARS = ("temperature_2m_min", "temperature_2m_max")
+HOURLY_VARS = ("temperature_2m", "shortwave_radiation")
+
+TMIN_PERCENTILES = (0.4, 1.0, 2.0, 5.0)
+TMAX_PERCENTILES = (95.0, 99.0, 99.6)
+
+# hours at or above this plane irradiance count as "irradiated"
+IRRADIATED_GHI_WM2 = 100.0
+
+
+@dataclass
+class SiteClimateProfile:
+    lat: float
+    lon: float
+    years: int
+    start_date: str
+    end_date: str
+    elevation: Optional[float] = None
+    days: int = 0
+    tmin_abs: Optional[float] = None
+    tmax_abs: Optional[float] = None
+    # keyed by percentile in percent, e.g. "1" -> 1st percentile of daily Tmin
+    tmin_pct: Dict[str, float] = field(default_factory=dict)
+    tmax_pct: Dict[str, float] = field(default_factory=dict)
+    # 1 °C histogram of daily Tmin: counts for bins starting at tmin_hist_lo
+    tmin_hist_lo: Optional[int] = None
+    tmin_hist: List[int] = field(default_factory=list)
+    # irradiance-coincident ambient temperature (hours with GHI >= threshold)
+    irradiated_hours: int = 0
+    irradiated_tmin: Optional[float] = None
+    irradiated_t_p1: Optional[float] = None
+    # raw hourly series for the hourly voltage engine (float32)
+    hourly_temp: Optional[np.ndarray] = field(default=None, repr=False)
+    hourly_ghi: Optional[np.ndarray] = field(default=None, repr=False)
+
+    def design_tmin(self, percentile: float = 0.01) -> Optional[int]:
+        v = self.tmin_pct.get(f"{percentile * 100:g}")
+        return None if v is None else math.floor(v)
+
+    def design_tmax(self, percentile: float = 0.99) -> Optional[int]:
+        v = self.tmax_pct.get(f"{percentile * 100:g}")
+        return None if v is None else math.ceil(v)
+
+    def summary(self) -> Dict:
+        """Key numbers for the review report."""
+        out = {
+            "Climate_days": self.days,
+            "Tmin_absolute_C": self.tmin_abs,
+            "Tmax_99pct_C": self.tmax_pct.get("99"),
+        }
+        if self.irradiated_hours:
+            out["Tmin_irradiated_C"] = self.irradiated_tmin
+        return out
+
+    def to_bytes(self) -> bytes:
+        meta = {
+            k: v
+            for k, v in asdict(self).items()
+            if k not in ("hourly_temp", "hourly_ghi")
+        }
+        arrays = {"meta": np.frombuffer(json.dumps(meta).encode("utf-8"), np.uint8)}
+        if self.hourly_temp is not None:
+            arrays["hourly_temp"] = self.hourly_temp
+            arrays["hourly_ghi"] = self.hourly_ghi
+        buf = io.BytesIO()
+        np.savez_compressed(buf, **arrays)
+        return buf.getvalue()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "SiteClimateProfile":
+        with np.load(io.BytesIO(blob)) as z:
+            meta = json.loads(z["meta"].tobytes().decode("utf-8"))
+            prof = cls(**meta)
+            if "hourly_temp" in z:
+                prof.hourly_temp = z["hourly_temp"]
+                prof.hourly_ghi = z["hourly_ghi"]
+        return prof
+
+
+def _floats(vals) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in vals], dtype=np.float32)
+
+
+def build_profile(
+    lat: float,
+    lon: float,
+    years: int,
+    start_d: date,
+    end_d: date,
+    chunks: List[Dict],
+) -> SiteClimateProfile:
+    """Summarize archive responses (in date order) in one vectorized pass."""
+    daily = {v: [] for v in DAILY_VARS}
+    hourly = {v: [] for v in HOURLY_VARS}
+    elevation = None
+    for data in chunks:
+        elevation = data.get("elevation", elevation)
+        d = data.get("daily", {}) or {}
+        h = data.get("hourly", {}) or {}
+        for v in DAILY_VARS:
+            daily[v].append(_floats(d.get(v, []) or []))
+        for v in HOURLY_VARS:
+            hourly[v].append(_floats(h.get(v, []) or []))
+
+    tmin = np.concatenate(daily["temperature_2m_min"] or [np.empty(0, np.float32)])
+    tmax = np.concatenate(daily["temperature_2m_max"] or [np.empty(0, np.float32)])
+    t_h = np.concatenate(hourly["temperature_2m"] or [np.empty(0, np.float32)])
+    g_h = np.concatenate(hourly["shortwave_radiation"] or [np.empty(0, np.float32)])
+
+    prof = SiteClimateProfile(
+        lat=float(lat),
+        lon=float(lon),
+        years=int(years),
+        start_date=start_d.isoformat(),
+        end_date=end_d.isoformat(),
+        elevation=None if elevation is None else float(elevation),
+    )
+
+    tmin = tmin[~np.isnan(tmin)].astype(np.float64)
+    tmax = tmax[~np.isnan(tmax)].astype(np.float64)
+    prof.days = int(tmin.size)
+    if tmin.size:
+        prof.tmin_abs = round(float(tmin.min()), 3)
+        pct = np.percentile(tmin, TMIN_PERCENTILES)
+        prof.tmin_pct = {
+            f"{p:g}": round(float(v), 3) for p, v in zip(TMIN_PERCENTILES, pct)
+        }
+        lo = int(np.floor(tmin.min()))
+        counts = np.bincount((np.floor(tmin) - lo).astype(np.int64))
+        prof.tmin_hist_lo, prof.tmin_hist = lo, counts.tolist()
+    if tmax.size:
+        prof.tmax_abs = round(float(tmax.max()), 3)
+        pct = np.percentile(tmax, TMAX_PERCENTILES)
+        prof.tmax_pct = {
+            f"{p:g}": round(float(v), 3) for p, v in zip(TMAX_PERCENTILES, pct)
+        }
+
+    if t_h.size and t_h.size == g_h.size:
+        prof.hourly_temp, prof.hourly_ghi = t_h, g_h
+        lit = (g_h >= IRRADIATED_GHI_WM2) & ~np.isnan(t_h)
+        prof.irradiated_hours = int(lit.sum())
+        if prof.irradiated_hours:
+            t_lit = t_h[lit].astype(np.float64)
+            prof.irradiated_tmin = round(float(t_lit.min()), 3)
+            prof.irradiated_t_p1 = round(float(np.percentile(t_lit, 1.0)), 3)
+
+    return prof
+
+
+def profile_request_params(lat: float, lon: float, start_d: date, end_d: date) -> Dict:
+    return {
+        "latitude": lat,
+        "longitude": lon,
+        "start_date": start_d.isoformat(),
+        "end_date": end_d.isoformat(),
+        "daily": ",".join(DAILY_VARS),
+        "hourly": ",".join(HOURLY_VARS),
+        "timezone": "auto",
+    }
+
+
+def profile_window(years: int) -> tuple:
+    end_d = date.today()
+    return end_d - timedelta(days=365 * years), end_d
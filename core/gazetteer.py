@@ -0,0 +1,96 @@
+"""
+Local gazetteer of Saudi and GCC places (core/data/gazetteer.csv).
+
+Loaded once per process into a sorted array of normalized names (English,
+Arabic and common transliterations); prefix search is two bisections.
+"""
+import csv
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+GAZETTEER_CSV = Path(__file__).resolve().parent / "data" / "gazetteer.csv"
+
+_AR_MAP = str.maketrans(
+    {"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ة": "ه", "ى": "ي", "ـ": None}
+)
+_ARTICLE = re.compile(r"^(?:al|el|ar|as|ad|an|at|az|ash)\s+|^ال")
+
+
+def normalize_name(s: str) -> str:
+    s = unicodedata.normalize("NFKD", str(s).translate(_AR_MAP))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = re.sub(r"['’`ʿʾ]", "", s.casefold())
+    s = re.sub(r"[\s\-_.,/]+", " ", s)
+    return s.strip()
+
+
+def _keys(name: str) -> List[str]:
+    k = normalize_name(name)
+    out = [k]
+    bare = _ARTICLE.sub("", k, count=1).strip()
+    if bare and bare != k:
+        out.append(bare)  # "Hofuf" finds "Al Hofuf", "رياض" finds "الرياض"
+    return out
+
+
+@lru_cache(maxsize=1)
+def _index() -> Tuple[List[Dict], List[str], List[int]]:
+    places, keys, ids = [], [], []
+    pairs = []
+    with open(GAZETTEER_CSV, "r", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            places.append(
+                {
+                    "name": row["name"],
+                    "admin1": row["admin1"] or None,
+                    "country": row["country"],
+                    "country_code": row["country_code"],
+                    "latitude": float(row["latitude"]),
+                    "longitude": float(row["longitude"]),
+                    "source": "local",
+                }
+            )
+            names = [row["name"]] + [a for a in row["alt_names"].split("|") if a]
+            for n in names:
+                for k in _keys(n):
+                    pairs.append((k, i))
+    pairs.sort()
+    for k, i in pairs:
+        keys.append(k)
+        ids.append(i)
+    return places, keys, ids
+
+
+def search_places(query: str, count: int = 5) -> List[Dict]:
+    """
+    Prefix search over the local gazetteer. Exact name matches rank first,
+    then file order (major cities are listed first).
+    """
+    q = normalize_name(query)
+    if not q:
+        return []
+    places, keys, ids = _index()
+    lo = bisect_left(keys, q)
+    hi = bisect_right(keys, q + "\uffff")
+
+    best: Dict[int, Tuple[int, int]] = {}
+    for pos in range(lo, hi):
+        i = ids[pos]
+        rank = (0 if keys[pos] == q else 1, i)
+        if i not in best or rank < best[i]:
+            best[i] = rank
+    ordered = sorted(best, key=best.get)
+    return [dict(places[i]) for i in ordered[:count]]
+
+
+def place_label(it: Dict) -> str:
+    name, admin1, country = it.get("name"), it.get("admin1"), it.get("country")
+    return f"{name}, {admin1}, {country}" if admin1 else f"{name}, {country}"
+
+
+def all_places() -> List[Dict]:
+    return [dict(p) for p in _index()[0]]
@@ -0,0 +1,174 @@
+"""
+Shared HTTP client for the Open-Meteo endpoints.
+
+One pooled keep-alive session per process, jittered exponential retry on
+transient errors, per-endpoint timeouts, a simple circuit breaker (fed by
+connection errors, timeouts and 5xx / 429 responses only) and
+latency/retry counters (see http_metrics()).
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds
+ENDPOINT_TIMEOUTS = {
+    "geocoding": (3.05, 8),
+    "forecast": (3.05, 10),
+    "archive": (3.05, 30),
+    "elevation": (3.05, 8),
+}
+DEFAULT_TIMEOUT = (3.05, 15)
+
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+# circuit breaker: open after N consecutive failures, retry after cooldown
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN_S = 30.0
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_metrics: Dict[str, Dict[str, float]] = {}
+_breakers: Dict[str, Dict[str, float]] = {}
+
+
+def _retry_policy() -> Retry:
+    kwargs = dict(
+        total=3,
+        connect=3,
+        read=2,
+        backoff_factor=0.4,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=0.3, **kwargs)
+    except TypeError:  # urllib3 < 2 has no jitter option
+        return Retry(**kwargs)
+
+
+def get_session() -> requests.Session:
+    global _session
+    with _lock:
+        if _session is None:
+            s = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+                pool_block=True,
+                max_retries=_retry_policy(),
+            )
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            s.headers.update({"User-Agent": "SANAD-PV-Review"})
+            _session = s
+        return _session
+
+
+def _record(endpoint: str, elapsed: float, retries: int, ok: bool, outage: bool = True):
+    with _lock:
+        m = _metrics.setdefault(
+            endpoint,
+            {
+                "requests": 0,
+                "failures": 0,
+                "retries": 0,
+                "latency_total_s": 0.0,
+                "latency_max_s": 0.0,
+            },
+        )
+        m["requests"] += 1
+        m["retries"] += retries
+        m["latency_total_s"] += elapsed
+        m["latency_max_s"] = max(m["latency_max_s"], elapsed)
+        if not ok:
+            m["failures"] += 1
+
+        # client errors / bad payloads say nothing about availability
+        if not ok and not outage:
+            return
+        b = _breakers.setdefault(endpoint, {"failures": 0, "opened_at": 0.0})
+        if ok:
+            b["failures"] = 0
+            b["opened_at"] = 0.0
+        else:
+            b["failures"] += 1
+            if b["failures"] >= BREAKER_THRESHOLD:
+                b["opened_at"] = time.monotonic()
+
+
+def _is_outage(exc: Exception) -> bool:
+    """Connection errors, timeouts and 5xx / 429 responses."""
+    if isinstance(
+        exc,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.RetryError,
+        ),
+    ):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return isinstance(exc, requests.HTTPError) and (
+        status is None or status >= 500 or status == 429
+    )
+
+
+def _check_breaker(endpoint: str):
+    with _lock:
+        b = _breakers.get(endpoint)
+        if not b or not b["opened_at"]:
+            return
+        if time.monotonic() - b["opened_at"] < BREAKER_COOLDOWN_S:
+            raise CircuitOpenError(
+                f"{endpoint} endpoint unavailable (circuit open after "
+                f"{int(b['failures'])} consecutive failures)"
+            )
+        # half-open: let one trial request through
+        b["opened_at"] = 0.0
+        b["failures"] = BREAKER_THRESHOLD - 1
+
+
+def get_json(endpoint: str, url: str, params: Dict) -> Dict:
+    _check_breaker(endpoint)
+    timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+
+    t0 = time.perf_counter()
+    retries = 0
+    try:
+        r = get_session().get(url, params=params, timeout=timeout)
+        history = getattr(getattr(r.raw, "retries", None), "history", None) or ()
+        retries = len(history)
+        r.raise_for_status()
+        data = r.json()
+    except Exception as e:
+        elapsed = time.perf_counter() - t0
+        _record(endpoint, elapsed, retries, ok=False, outage=_is_outage(e))
+        raise
+    _record(endpoint, time.perf_counter() - t0, retries, ok=True)
+    return data
+
+
+def http_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-endpoint counters; latency_avg_s is derived."""
+    with _lock:
+        out = {}
+        for ep, m in _metrics.items():
+            row = dict(m)
+            n = m["requests"]
+            row["latency_avg_s"] = m["latency_total_s"] / n if n else 0.0
+            row["circuit_open"] = bool(_breakers.get(ep, {}).get("opened_at"))
+            out[ep] = row
+        return out
@@ -0,0 +1,13 @@
+import os
+from pathlib import Path
+
+
+def data_dir() -> Path:
+    """
+    Writable directory for local caches and datasets.
+    Shared by all Streamlit sessions and server processes on the host.
+    Override with SANAD_DATA_DIR.
+    """
+    d = Path(os.environ.get("SANAD_DATA_DIR") or (Path.home() / ".cache" / "sanad"))
+    d.mkdir(parents=True, exist_ok=True)
+    return d
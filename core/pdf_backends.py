@@ -0,0 +1,115 @@
+"""
+PDF text backends.
+
+Each backend opens a PDF from bytes and returns (page count, page text
+function). The backend is chosen by SANAD_PDF_BACKEND or, when unset, the
+first installed one in AUTO_ORDER (fastest with full recall on the
+synthetic SLD corpus, see bench/pdf_backends.py). Libraries are imported
+lazily; PyPDF2 is the baseline dependency.
+"""
+
+import importlib.util
+import io
+import os
+import threading
+from typing import Callable, List, Optional, Tuple
+
+PageText = Callable[[int], str]
+
+# pdfium is not thread-safe; Streamlit sessions share one process
+_pdfium_lock = threading.Lock()
+
+
+def _open_pypdf2(data: bytes) -> Tuple[int, PageText]:
+    import PyPDF2  # type: ignore
+
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return len(reader.pages), lambda i: reader.pages[i].extract_text() or ""
+
+
+def _open_pypdf(data: bytes) -> Tuple[int, PageText]:
+    import pypdf  # type: ignore
+
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    return len(reader.pages), lambda i: reader.pages[i].extract_text() or ""
+
+
+def _open_pdfminer(data: bytes) -> Tuple[int, PageText]:
+    from pdfminer.converter import TextConverter  # type: ignore
+    from pdfminer.layout import LAParams  # type: ignore
+    from pdfminer.pdfdocument import PDFDocument  # type: ignore
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager  # type: ignore
+    from pdfminer.pdfpage import PDFPage  # type: ignore
+    from pdfminer.pdfparser import PDFParser  # type: ignore
+
+    pages = list(PDFPage.create_pages(PDFDocument(PDFParser(io.BytesIO(data)))))
+    rsrc = PDFResourceManager()
+
+    def text(i: int) -> str:
+        out = io.StringIO()
+        device = TextConverter(rsrc, out, laparams=LAParams())
+        try:
+            PDFPageInterpreter(rsrc, device).process_page(pages[i])
+        finally:
+            device.close()
+        return out.getvalue()
+
+    return len(pages), text
+
+
+def _open_pdfium(data: bytes) -> Tuple[int, PageText]:
+    import pypdfium2 as pdfium  # type: ignore
+
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(data)
+        n = len(pdf)
+
+    def text(i: int) -> str:
+        with _pdfium_lock:
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+
+    return n, text
+
+
+# name -> (importable module, opener)
+BACKENDS = {
+    "pypdfium2": ("pypdfium2", _open_pdfium),
+    "pypdf": ("pypdf", _open_pypdf),
+    "pdfminer": ("pdfminer", _open_pdfminer),
+    "pypdf2": ("PyPDF2", _open_pypdf2),
+}
+AUTO_ORDER = ["pypdfium2", "pypdf2", "pypdf", "pdfminer"]
+
+
+def available_backends() -> List[str]:
+    return [
+        name
+        for name, (module, _) in BACKENDS.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+
+
+def backend_name(name: Optional[str] = None) -> str:
+    """Explicit name, else SANAD_PDF_BACKEND, else the first installed one."""
+    name = (name or os.environ.get("SANAD_PDF_BACKEND") or "").strip().lower()
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(
+                f"Unknown PDF backend {name!r}; choose from {', '.join(BACKENDS)}"
+            )
+        return name
+    installed = available_backends()
+    for candidate in AUTO_ORDER:
+        if candidate in installed:
+            return candidate
+    raise ImportError("No PDF text backend installed (PyPDF2 is required).")
+
+
+def open_pdf(data: bytes, backend: Optional[str] = None) -> Tuple[int, PageText]:
+    return BACKENDS[backend_name(backend)][1](data)
@@ -0,0 +1,179 @@
+"""
+Stage 2 review pipeline.
+
+Each stage is memoized with st.cache_data on string keys derived from its
+inputs (upload fingerprints from core.uploads when present, else content
+hashes, plus the datasheet catalog version for everything derived from
+the BoM), so entries are shared across sessions and a rerun that changes
+nothing only pays for the cache lookups. Arguments prefixed with "_" are
+the payloads themselves and are excluded from Streamlit's hashing.
+"""
+
+import hashlib
+from typing import Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+from core.bom_validate import validate_bom
+from core.catalog import catalog_version
+from core.review import (
+    CheckStatus,
+    batch_climate_voltage_check,
+    climate_voltage_check,
+    compare_bom_vs_sld,
+    extract_bom_signals,
+    extract_bom_strings,
+    failing_string_recs,
+    hourly_string_voc,
+    saudi_standards_snapshot,
+    try_extract_from_sld,
+    worst_string_signals,
+)
+from core.sizing import build_sizing_table, design_t_cell_hot, tables_from_strings
+
+CACHE_ENTRIES = 64
+
+
+def input_key(fp: Optional[Dict], obj) -> str:
+    """Upload fingerprint hash if recorded, else a hash of the content."""
+    if fp:
+        return fp["hash"]
+    if isinstance(obj, pd.DataFrame):
+        h = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+        cols = "|".join(map(str, obj.columns)).encode()
+        return hashlib.blake2b(h.tobytes() + cols, digest_size=16).hexdigest()
+    return hashlib.blake2b(bytes(obj), digest_size=16).hexdigest()
+
+
+def profile_key(profile) -> Optional[str]:
+    if profile is None:
+        return None
+    return f"{profile.lat:.4f},{profile.lon:.4f},{profile.years},{profile.end_date}"
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def bom_stage(bom_key: str, _bom_df: pd.DataFrame) -> Dict:
+    df, issues = validate_bom(_bom_df)
+    return {
+        "issues": issues,
+        "signals": extract_bom_signals(df),
+        "strings": extract_bom_strings(df),
+    }
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def sld_stage(sld_key: str, _sld_bytes: bytes) -> Dict:
+    return try_extract_from_sld(_sld_bytes)
+
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner=False)
+def review_stage(
+    bom_key: str,
+    sld_key: str,
+    tmin: float,
+    prof_key: Optional[str],
+    _bom: Dict,
+    _sld_sig: Dict,
+    _profile,
+) -> Dict:
+    bom_sig = _bom["signals"]
+
+    # 1) BoM vs SLD; INFO is reported as PASS
+    doc = compare_bom_vs_sld(bom_sig, _sld_sig)
+    doc_level = (doc.level or "PASS").upper()
+    if doc_level == "INFO":
+        doc_level = "PASS"
+
+    # 2) every BoM string, then the headline check on the worst of them
+    strings = batch_climate_voltage_check(_bom["strings"], tmin)
+    n_fail = int((strings["status"] == "FAIL").sum())
+    unknown = strings[strings["status"] == "UNKNOWN"]
+    head = worst_string_signals(strings, bom_sig)
+    climate, numbers, recs = climate_voltage_check(head, tmin)
+    if n_fail:
+        # one action per failing inverter instead of the worst string only
+        recs = failing_string_recs(strings) + recs[1:]
+    if len(unknown):
+        rows = ", ".join(str(r) for r in unknown["row"].head(5))
+        if climate.level == "PASS":
+            climate = CheckStatus(
+                "WARN",
+                climate.title,
+                climate.details + [f"{len(unknown)} string(s) could not be verified."],
+            )
+        recs.append(
+            f"Correct the modules/string value of BoM row(s) {rows}"
+            f"{', …' if len(unknown) > 5 else ''}: it was rejected, so "
+            f"{len(unknown)} string(s) were not verified."
+        )
+    if _profile is not None:
+        numbers.update(_profile.summary())
+        if _profile.hourly_temp is not None and _profile.irradiated_hours:
+            # cold, irradiated hours: the real operating worst case
+            hourly = hourly_string_voc(
+                _profile.hourly_temp,
+                _profile.hourly_ghi,
+                head["voc_stc"],
+                head["temp_coeff"],
+                head["modules_per_string"],
+                head["inverter_vmax"],
+            ).iloc[0]
+            numbers["String_Voc_hourly_worst_V"] = round(
+                float(hourly["worst_string_voc_V"]), 1
+            )
+            numbers["Hours_over_inverter_DC_max"] = int(hourly["hours_over_vmax"])
+    numbers["BoM_values_rejected"] = int(len(_bom["issues"]))
+    if len(strings) > 1:
+        numbers["Strings_checked"] = int(len(strings))
+        numbers["Strings_over_DC_max"] = n_fail
+    if len(unknown):
+        numbers["Strings_unverified"] = int(len(unknown))
+
+    # what-if: which BoM inverters fit each module, at what string lengths
+    mods, invs = tables_from_strings(strings)
+    sizing = build_sizing_table(
+        mods,
+        invs,
+        t_cell_hot=design_t_cell_hot(
+            _profile.design_tmax() if _profile is not None else None
+        ),
+    )
+
+    # 3) standards snapshot
+    compliant, gaps = saudi_standards_snapshot(
+        climate_ok=(climate.level == "PASS" and n_fail == 0 and unknown.empty),
+        bom_sld_level=doc_level,
+    )
+
+    return {
+        "doc": doc,
+        "doc_level": doc_level,
+        "climate": climate,
+        "numbers": numbers,
+        "recs": recs or [],
+        "strings": strings,
+        "n_fail": n_fail,
+        "sizing": sizing,
+        "compliant": compliant,
+        "gaps": gaps,
+    }
+
+
+def run_review(bom_df, sld_bytes, tmin: float, profile=None) -> Dict:
+    """
+    Whole Stage 2 review for the current session inputs; each stage is
+    recomputed only when its own inputs changed.
+    """
+    bom_key = input_key(st.session_state.get("bom_fp"), bom_df)
+    # BoM signals fall back to datasheet values: a catalog import invalidates them
+    bom_key += "|" + catalog_version()
+    sld_key = input_key(st.session_state.get("sld_fp"), sld_bytes)
+    bom = bom_stage(bom_key, bom_df)
+    sld_sig = sld_stage(sld_key, sld_bytes)
+    result = review_stage(
+        bom_key, sld_key, float(tmin), profile_key(profile), bom, sld_sig, profile
+    )
+    result["bom_issues"] = bom["issues"]
+    result["sld"] = sld_sig
+    return result
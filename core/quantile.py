@@ -0,0 +1,55 @@
+import math
+from typing import Iterable
+
+import numpy as np
+
+
+class HistogramSketch:
+    """
+    Mergeable fixed-resolution quantile sketch for temperatures.
+
+    Archive temperatures are reported at 0.1 °C, so counting them in 0.1 °C
+    bins loses nothing: quantile() reproduces pandas' linear interpolation
+    exactly while memory stays constant (one int64 per bin) no matter how
+    many years are folded in. Chunks can be summarized independently and
+    merged in any order.
+    """
+
+    def __init__(self, lo: float = -90.0, hi: float = 70.0, res: float = 0.1):
+        self.lo = float(lo)
+        self.res = float(res)
+        self.counts = np.zeros(int(round((hi - lo) / res)) + 1, dtype=np.int64)
+
+    @property
+    def n(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, values: Iterable[float]):
+        v = np.asarray(
+            [x for x in values if x is not None], dtype="float64"
+        )
+        v = v[~np.isnan(v)]
+        if not v.size:
+            return
+        idx = np.rint((v - self.lo) / self.res).astype(np.int64)
+        np.clip(idx, 0, self.counts.size - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.counts.size)
+
+    def merge(self, other: "HistogramSketch"):
+        self.counts += other.counts
+
+    def _order_stat(self, cum: np.ndarray, k: int) -> float:
+        # value of the k-th smallest sample (0-based)
+        i = int(np.searchsorted(cum, k + 1))
+        return self.lo + i * self.res
+
+    def quantile(self, q: float) -> float:
+        n = self.n
+        if not n:
+            return float("nan")
+        cum = np.cumsum(self.counts)
+        h = (n - 1) * float(q)
+        k = int(math.floor(h))
+        v0 = self._order_stat(cum, k)
+        v1 = self._order_stat(cum, min(k + 1, n - 1))
+        return round(v0 + (h - k) * (v1 - v0), 6)
@@ -1,10 +1,21 @@
+import hashlib
 import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
 from reportlab.pdfgen import canvas
 
+MAX_CACHED_REPORTS = 32
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sanad-report")
+_reports: "OrderedDict[str, Future]" = OrderedDict()
+_reports_lock = threading.Lock()
+
 
 def generate_sanad_report(payload: dict) -> bytes:
     """
@@ -124,3 +135,29 @@ def generate_sanad_report(payload: dict) -> bytes:
 
 def now_date_str():
     return datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
+def report_key(payload: dict) -> str:
+    # date_str is part of the key: the PDF prints it, so a cached report must
+    # never carry an earlier timestamp
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+def report_future(payload: dict) -> Future:
+    """
+    Background generate_sanad_report(), shared across sessions and cached
+    by payload hash (LRU, MAX_CACHED_REPORTS). Failed builds are retried
+    on the next request.
+    """
+    key = report_key(payload)
+    with _reports_lock:
+        fut = _reports.get(key)
+        if fut is not None and not (fut.done() and fut.exception() is not None):
+            _reports.move_to_end(key)
+            return fut
+        fut = _executor.submit(generate_sanad_report, payload)
+        _reports[key] = fut
+        while len(_reports) > MAX_CACHED_REPORTS:
+            _reports.popitem(last=False)
+        return fut
@@ -1,11 +1,16 @@
-import io
 import math
-import re
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from core.bom_validate import validate_bom
+from core.catalog import lookup_inverter, lookup_module
+from core.pdf_backends import backend_name
+from core.schema import resolve_columns
+from core.sld_scan import iter_page_texts, scan_pages
+
 
 @dataclass
 class CheckStatus:
@@ -14,6 +19,15 @@ class CheckStatus:
     details: List[str]
 
 
+BOM_DEFAULTS = {
+    "voc_stc": 49.5,
+    "temp_coeff": -0.0029,
+    "modules_per_string": 22,
+    "inverter_vmax": 1100.0,
+    "inverter_name": "Inverter model not specified",
+}
+
+
 def smart_find_col(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
     cols = {c.lower(): c for c in df.columns}
     for cand in candidates:
@@ -24,7 +38,7 @@ def smart_find_col(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
 
 def extract_bom_signals(df: pd.DataFrame) -> Dict:
     """
-    Extract signals from BoM with flexible column names.
+    Extract signals from BoM with flexible column names (see core.schema).
     Required for checks:
       - Voc_STC per module
       - Temp coefficient for Voc (per °C)
@@ -32,56 +46,77 @@ def extract_bom_signals(df: pd.DataFrame) -> Dict:
       - Inverter DC max voltage
       - Inverter model/name (optional)
     """
-    c_voc = smart_find_col(df, ["Voc_STC", "Voc", "Module_Voc", "PV_Voc"])
-    c_tc = smart_find_col(
-        df, ["TempCoeff", "Temp_Coeff", "Voc_TempCoeff", "TempCoeff_Voc"]
-    )
-    c_mps = smart_find_col(
-        df, ["ModulesPerString", "Modules_per_string", "MPS", "PanelsPerString"]
-    )
-    c_inv = smart_find_col(df, ["Inverter_Vmax", "InverterVmax", "DC_Vmax", "Vmax_DC"])
-    c_inv_name = smart_find_col(
-        df, ["Inverter", "InverterModel", "INV_Model", "Inverter_Model"]
-    )
+    df, _ = validate_bom(df)
+    cols = resolve_columns(df.columns)
+    c_voc = cols["voc_stc"]
+    c_tc = cols["temp_coeff"]
+    c_mps = cols["modules_per_string"]
+    c_inv = cols["inverter_vmax"]
+    c_inv_name = cols["inverter_name"]
+    c_mod = cols["module_model"]
+
+    def first(col):
+        if col and not df[col].dropna().empty:
+            return df[col].dropna().iloc[0]
+        return None
+
+    voc_stc = first(c_voc)
+    temp_coeff = first(c_tc)
+    mps = first(c_mps)
+    inverter_vmax = first(c_inv)
+    inverter_name = first(c_inv_name)
+    module_model = first(c_mod)
+
+    # frames from core.bom_io carry canonical names; report the original headers
+    src = df.attrs.get("source_columns", {})
+
+    def source(field, col, value):
+        return src.get(field, col) if value is not None else "DEFAULT"
 
-    voc_stc = (
-        float(df[c_voc].dropna().iloc[0])
-        if c_voc and not df[c_voc].dropna().empty
-        else 49.5
-    )
+    meta = {
+        "voc_source": source("voc_stc", c_voc, voc_stc),
+        "tc_source": source("temp_coeff", c_tc, temp_coeff),
+        "mps_source": source("modules_per_string", c_mps, mps),
+        "vmax_source": source("inverter_vmax", c_inv, inverter_vmax),
+        "invname_source": source("inverter_name", c_inv_name, inverter_name),
+    }
+
+    # datasheet catalog before magic defaults
+    if module_model is not None and (voc_stc is None or temp_coeff is None):
+        rec = lookup_module(str(module_model))
+        if rec:
+            if voc_stc is None and rec.get("voc_stc") is not None:
+                voc_stc = rec["voc_stc"]
+                meta["voc_source"] = f"CATALOG:{rec['model']}"
+            if temp_coeff is None and rec.get("temp_coeff_voc") is not None:
+                temp_coeff = rec["temp_coeff_voc"]
+                meta["tc_source"] = f"CATALOG:{rec['model']}"
+    if inverter_name is not None and inverter_vmax is None:
+        rec = lookup_inverter(str(inverter_name))
+        if rec and rec.get("vdc_max") is not None:
+            inverter_vmax = rec["vdc_max"]
+            meta["vmax_source"] = f"CATALOG:{rec['model']}"
+
+    voc_stc = float(voc_stc) if voc_stc is not None else BOM_DEFAULTS["voc_stc"]
     temp_coeff = (
-        float(df[c_tc].dropna().iloc[0])
-        if c_tc and not df[c_tc].dropna().empty
-        else -0.0029
-    )
-    mps = (
-        int(df[c_mps].dropna().iloc[0])
-        if c_mps and not df[c_mps].dropna().empty
-        else 22
+        float(temp_coeff) if temp_coeff is not None else BOM_DEFAULTS["temp_coeff"]
     )
+    mps = int(mps) if mps is not None else BOM_DEFAULTS["modules_per_string"]
     inverter_vmax = (
-        float(df[c_inv].dropna().iloc[0])
-        if c_inv and not df[c_inv].dropna().empty
-        else 1100.0
+        float(inverter_vmax)
+        if inverter_vmax is not None
+        else BOM_DEFAULTS["inverter_vmax"]
     )
     inverter_name = (
-        str(df[c_inv_name].dropna().iloc[0])
-        if c_inv_name and not df[c_inv_name].dropna().empty
-        else "Inverter model not specified"
+        str(inverter_name)
+        if inverter_name is not None
+        else BOM_DEFAULTS["inverter_name"]
     )
 
-    # normalize percent coefficients
+    # catalog coefficients may be in percent (BoM values already validated)
     if abs(temp_coeff) > 0.05:
         temp_coeff = temp_coeff / 100.0
 
-    meta = {
-        "voc_source": c_voc or "DEFAULT",
-        "tc_source": c_tc or "DEFAULT",
-        "mps_source": c_mps or "DEFAULT",
-        "vmax_source": c_inv or "DEFAULT",
-        "invname_source": c_inv_name or "DEFAULT",
-    }
-
     return {
         "voc_stc": voc_stc,
         "temp_coeff": temp_coeff,
@@ -92,48 +127,201 @@ def extract_bom_signals(df: pd.DataFrame) -> Dict:
     }
 
 
-def try_extract_from_sld(pdf_bytes: bytes) -> Dict:
+def _numeric(df: pd.DataFrame, col: Optional[str]) -> pd.Series:
+    if not col:
+        return pd.Series(np.nan, index=df.index, dtype="float64")
+    return pd.to_numeric(df[col], errors="coerce").astype("float64")
+
+
+def extract_bom_strings(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Best-effort PDF text extraction (first pages) + regex.
-    Returns: inverter_vmax, modules_per_string, notes
+    One row per BoM string (rows with modules/string, or with a module Voc
+    when the BoM has no such column), with its inverter's DC max joined in.
+    Vectorized over the whole BoM:
+      - rows carrying an inverter name + DC max form the inverter table
+      - rows carrying a module model + Voc / coefficient form the module table
+      - strings take the DC max of their named inverter, else their own
+        value, else the default
     """
-    out = {"inverter_vmax": None, "modules_per_string": None, "notes": ""}
+    df, _ = validate_bom(df)
+    cols = resolve_columns(df.columns)
+
+    voc = _numeric(df, cols["voc_stc"])
+    tc = _numeric(df, cols["temp_coeff"])
+    mps = _numeric(df, cols["modules_per_string"])
+    vmax = _numeric(df, cols["inverter_vmax"])
+    if cols["inverter_name"]:
+        name = df[cols["inverter_name"]].astype("string").str.strip()
+        name = name.where(name != "")
+    else:
+        name = pd.Series(pd.NA, index=df.index, dtype="string")
+
+    # a rejected modules/string keeps its row: the string exists, its
+    # length is unknown (checked at the default length, status UNKNOWN)
+    rejected = df.attrs.get("rejected", {}).get("modules_per_string", [])
+    mps_rejected = mps.isna() & pd.Series(df.index.isin(rejected), index=df.index)
+
+    # with a modules/string column (e.g. a Strings sheet next to a Modules
+    # sheet) only those rows are strings; otherwise any row with a Voc
+    has_mps = mps.notna() | mps_rejected
+    is_string = has_mps if has_mps.any() else voc.notna()
+
+    if cols["module_model"]:
+        models = df[cols["module_model"]].astype("string").str.strip()
+
+        # module table: first Voc / coefficient seen per model name
+        def by_model(s):
+            known = pd.DataFrame({"model": models, "v": s}).dropna()
+            known = known.drop_duplicates("model").set_index("model")["v"]
+            return s.fillna(models.map(known))
+
+        voc, tc = by_model(voc), by_model(tc)
+
+    # datasheet catalog: one lookup per distinct model name
+    if cols["module_model"] and (voc.isna() | tc.isna()).any():
+        recs = {m: lookup_module(m) or {} for m in models.dropna().unique()}
+        cat_voc = models.map(lambda m: recs.get(m, {}).get("voc_stc"))
+        cat_tc = models.map(lambda m: recs.get(m, {}).get("temp_coeff_voc"))
+        voc = voc.fillna(pd.to_numeric(cat_voc, errors="coerce"))
+        tc = tc.fillna(pd.to_numeric(cat_tc, errors="coerce"))
+
+    if not is_string.any():
+        sig = extract_bom_signals(df)
+        return pd.DataFrame(
+            [
+                {
+                    "row": 0,
+                    "inverter_name": sig["inverter_name"],
+                    "voc_stc": sig["voc_stc"],
+                    "temp_coeff": sig["temp_coeff"],
+                    "modules_per_string": sig["modules_per_string"],
+                    "inverter_vmax": sig["inverter_vmax"],
+                }
+            ]
+        )
 
-    try:
-        import PyPDF2  # type: ignore
+    # inverter table: first DC max seen per inverter name
+    inv = pd.DataFrame({"name": name, "vmax": vmax}).dropna().drop_duplicates("name")
+    joined = name.map(inv.set_index("name")["vmax"])
+    unresolved = name[joined.isna() & vmax.isna()].dropna().unique()
+    if len(unresolved):
+        cat = {n: (lookup_inverter(n) or {}).get("vdc_max") for n in unresolved}
+        joined = joined.fillna(pd.to_numeric(name.map(cat), errors="coerce"))
+
+    tc = tc.fillna(BOM_DEFAULTS["temp_coeff"])
+    tc = tc.where(tc.abs() <= 0.05, tc / 100.0)
+
+    out = pd.DataFrame(
+        {
+            "row": df.index,
+            "inverter_name": name.fillna(BOM_DEFAULTS["inverter_name"]),
+            "voc_stc": voc.fillna(BOM_DEFAULTS["voc_stc"]),
+            "temp_coeff": tc,
+            "modules_per_string": mps.fillna(BOM_DEFAULTS["modules_per_string"]),
+            "inverter_vmax": joined.fillna(vmax).fillna(BOM_DEFAULTS["inverter_vmax"]),
+            "mps_rejected": mps_rejected,
+        }
+    )[is_string.to_numpy()]
+    out["modules_per_string"] = out["modules_per_string"].astype("int64")
+    return out.reset_index(drop=True)
+
+
+def batch_climate_voltage_check(strings: pd.DataFrame, tmin: float) -> pd.DataFrame:
+    """
+    climate_voltage_check for every string at once.
+    Input: extract_bom_strings() frame. Adds Voc at Tmin, string Voc, margin,
+    status (PASS/FAIL; UNKNOWN where the BoM modules/string was rejected)
+    and the largest safe modules/string.
+    """
+    out = strings.copy()
+    voc_cold = out["voc_stc"] * (1.0 + out["temp_coeff"].abs() * (25.0 - float(tmin)))
+    out["voc_cold_V"] = voc_cold
+    out["string_voc_V"] = voc_cold * out["modules_per_string"]
+    out["margin_V"] = out["inverter_vmax"] - out["string_voc_V"]
+    out["status"] = np.where(out["margin_V"] >= 0, "PASS", "FAIL")
+    if "mps_rejected" in out:
+        out["status"] = out["status"].where(~out["mps_rejected"], "UNKNOWN")
+    safe = np.floor(out["inverter_vmax"] / voc_cold).clip(lower=1)
+    out["safe_modules_per_string"] = np.minimum(safe, out["modules_per_string"]).astype(
+        "int64"
+    )
+    return out
+
+
+def worst_string_signals(strings: pd.DataFrame, bom_sig: Dict) -> Dict:
+    """
+    bom_sig with the values of the string with the least margin, so the
+    headline check reports the worst string rather than the first BoM row.
+    """
+    margin = strings["margin_V"] if len(strings) else pd.Series(dtype="float64")
+    if len(strings):
+        margin = margin.where(strings["status"] != "UNKNOWN")
+    if margin.notna().sum() == 0:
+        return bom_sig
+    worst = strings.loc[margin.idxmin()]
+    return dict(
+        bom_sig,
+        voc_stc=float(worst["voc_stc"]),
+        temp_coeff=float(worst["temp_coeff"]),
+        modules_per_string=int(worst["modules_per_string"]),
+        inverter_vmax=float(worst["inverter_vmax"]),
+        inverter_name=str(worst["inverter_name"]),
+    )
 
-        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
-        text = ""
-        for i in range(min(len(reader.pages), 3)):
-            text += "\n" + (reader.pages[i].extract_text() or "")
 
-        if not text.strip():
+def failing_string_recs(strings: pd.DataFrame) -> List[str]:
+    """One recommendation per inverter with failing strings (batch check frame)."""
+    fail = strings[strings["status"] == "FAIL"]
+    recs = []
+    for name, g in fail.groupby(fail["inverter_name"].astype(str), sort=False):
+        rows = ", ".join(str(r) for r in g["row"].head(5))
+        if len(g) > 5:
+            rows += ", …"
+        recs.append(
+            f"{name}: reduce modules/string from {int(g['modules_per_string'].max())} "
+            f"to {int(g['safe_modules_per_string'].min())} to keep string Voc at "
+            f"Tmin ≤ {g['inverter_vmax'].min():.0f} V ({len(g)} string(s), "
+            f"BoM row(s) {rows})."
+        )
+    return recs
+
+
+def try_extract_from_sld(pdf_bytes: bytes, targets=None) -> Dict:
+    """
+    Best-effort PDF text extraction, streamed page by page (all pages, early
+    exit once every target signal is found; default: the review signals,
+    see core.sld_signals.REVIEW_SIGNALS).
+    Returns: inverter_vmax, modules_per_string, signals (all found values),
+    pages (signal -> page), notes
+    """
+    out = {
+        "inverter_vmax": None,
+        "modules_per_string": None,
+        "signals": {},
+        "pages": {},
+        "notes": "",
+    }
+
+    try:
+        backend = backend_name()
+        found, scanned, has_text = scan_pages(
+            iter_page_texts(pdf_bytes, backend), targets=targets
+        )
+
+        if not has_text:
             out["notes"] = "SLD text extraction empty (scan/image likely)."
             return out
 
-        vmax_patterns = [
-            r"(?:DC\s*MAX|DC\s*MAXIMUM|VDC\s*MAX|V\s*MAX|MAX\s*DC)\s*[:=]?\s*(\d{3,4})\s*V",
-            r"(?:Vmax|V\s*max)\s*[:=]?\s*(\d{3,4})\s*V",
-            r"(\d{3,4})\s*V\s*(?:DC\s*MAX|VDC\s*MAX|MAX\s*DC)",
-        ]
-        for pat in vmax_patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
-            if m:
-                out["inverter_vmax"] = float(m.group(1))
-                break
-
-        mps_patterns = [
-            r"(?:MODULES\s*/\s*STRING|MODULES\s*PER\s*STRING|MOD\s*/\s*STR)\s*[:=]?\s*(\d{1,3})",
-            r"\bMPS\b\s*[:=]?\s*(\d{1,3})",
-            r"(?:STRING)\s*[:=]?\s*(\d{1,3})\s*(?:MODULES|MOD)",
-        ]
-        for pat in mps_patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
-            if m:
-                out["modules_per_string"] = int(m.group(1))
-                break
+        for name, (value, page) in found.items():
+            out["signals"][name] = value
+            out["pages"][name] = page
+        out["inverter_vmax"] = out["signals"].get("inverter_vmax")
+        out["modules_per_string"] = out["signals"].get("modules_per_string")
 
-        out["notes"] = "SLD signals extracted from text (best-effort)."
+        out["notes"] = (
+            f"SLD signals extracted from text (best-effort, {backend}, "
+            f"{scanned} page(s) scanned)."
+        )
         return out
 
     except Exception as e:
@@ -141,6 +329,11 @@ def try_extract_from_sld(pdf_bytes: bytes) -> Dict:
         return out
 
 
+def _sld_ref(sld_sig: Dict, name: str) -> str:
+    page = sld_sig.get("pages", {}).get(name)
+    return f", p. {page}" if page else ""
+
+
 def compare_bom_vs_sld(bom_sig: Dict, sld_sig: Dict) -> CheckStatus:
     mismatch = []
     gaps = []
@@ -153,7 +346,7 @@ def compare_bom_vs_sld(bom_sig: Dict, sld_sig: Dict) -> CheckStatus:
             > 1e-6
         ):
             mismatch.append(
-                f"Inverter DC max differs (BoM {bom_sig['inverter_vmax']:.0f} V vs SLD {float(sld_sig['inverter_vmax']):.0f} V)."
+                f"Inverter DC max differs (BoM {bom_sig['inverter_vmax']:.0f} V vs SLD {float(sld_sig['inverter_vmax']):.0f} V{_sld_ref(sld_sig, 'inverter_vmax')})."
             )
 
     if sld_sig.get("modules_per_string") is None:
@@ -161,7 +354,7 @@ def compare_bom_vs_sld(bom_sig: Dict, sld_sig: Dict) -> CheckStatus:
     else:
         if int(bom_sig["modules_per_string"]) != int(sld_sig["modules_per_string"]):
             mismatch.append(
-                f"Modules/string differs (BoM {bom_sig['modules_per_string']} vs SLD {int(sld_sig['modules_per_string'])})."
+                f"Modules/string differs (BoM {bom_sig['modules_per_string']} vs SLD {int(sld_sig['modules_per_string'])}{_sld_ref(sld_sig, 'modules_per_string')})."
             )
 
     if mismatch:
@@ -184,6 +377,79 @@ def calc_voc_cold(voc_stc: float, temp_coeff: float, tmin: float) -> float:
     return voc_stc * (1.0 + abs(temp_coeff) * delta)
 
 
+# NOCT cell-temperature model; hours below IRRADIATED_GHI produce no usable Voc
+NOCT_C = 45.0
+IRRADIATED_GHI = 100.0
+
+
+def cell_temperature(temp_air, ghi, noct: float = NOCT_C):
+    # Tc = Ta + (NOCT - 20) / 800 * G
+    return temp_air + np.float32((noct - 20.0) / 800.0) * ghi
+
+
+def hourly_string_voc(
+    temp_air,
+    ghi,
+    voc_stc,
+    temp_coeff,
+    modules_per_string,
+    inverter_vmax=None,
+    ghi_min: float = IRRADIATED_GHI,
+    noct: float = NOCT_C,
+) -> pd.DataFrame:
+    """
+    Worst-case string Voc over every irradiated hour, for every string
+    configuration at once.
+      temp_air, ghi: hourly ambient °C and irradiance W/m² (N,)
+      voc_stc, temp_coeff, modules_per_string, inverter_vmax: scalars or (K,)
+    Builds one float32 (hours x configs) matrix; 87k hours x 50 configs is
+    ~17 MB and well under a second.
+    """
+    t = np.asarray(temp_air, dtype=np.float32)
+    g = np.asarray(ghi, dtype=np.float32)
+    lit = (g >= ghi_min) & np.isfinite(t) & np.isfinite(g)
+    hour_idx = np.flatnonzero(lit)
+    tc = cell_temperature(t[lit], g[lit], noct)
+
+    voc = np.atleast_1d(np.asarray(voc_stc, dtype=np.float32))
+    tcoef = np.abs(np.atleast_1d(np.asarray(temp_coeff, dtype=np.float32)))
+    mps = np.atleast_1d(np.asarray(modules_per_string, dtype=np.float32))
+    voc, tcoef, mps = np.broadcast_arrays(voc, tcoef, mps)
+
+    out = pd.DataFrame(
+        {
+            "voc_stc": voc,
+            "temp_coeff": -tcoef,
+            "modules_per_string": mps.astype(np.int32),
+        }
+    )
+    if not tc.size:
+        out["worst_string_voc_V"] = np.nan
+        out["worst_cell_temp_C"] = np.nan
+        out["worst_hour_index"] = -1
+        out["irradiated_hours"] = 0
+        return out
+
+    # (N, K): Voc_cold = Voc_STC * (1 + |coeff| * (25 - Tc)) * modules/string
+    string_v = (1.0 + (np.float32(25.0) - tc)[:, None] * tcoef[None, :]) * (
+        voc * mps
+    )[None, :]
+    worst = string_v.argmax(axis=0)
+
+    out["worst_string_voc_V"] = string_v[worst, np.arange(string_v.shape[1])]
+    out["worst_cell_temp_C"] = tc[worst]
+    out["worst_hour_index"] = hour_idx[worst]
+    out["irradiated_hours"] = int(tc.size)
+
+    if inverter_vmax is not None:
+        vmax = np.broadcast_to(
+            np.asarray(inverter_vmax, dtype=np.float32), voc.shape
+        ).astype(np.float32)
+        out["inverter_vmax"] = vmax
+        out["hours_over_vmax"] = (string_v > vmax[None, :]).sum(axis=0)
+    return out
+
+
 def climate_voltage_check(
     bom_sig: Dict, tmin: float
 ) -> Tuple[CheckStatus, Dict, List[str]]:
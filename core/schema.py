@@ -0,0 +1,231 @@
+"""
+BoM header resolution.
+
+Headers are normalized (case, whitespace/separators, bracketed units,
+Arabic letter variants) and matched against a declarative alias registry,
+exactly first and then fuzzily (quantity headers never fuzzy-match a
+model / name field, nor a header fuzzy-match across min/max, AC/DC or
+Voc/Vmp/Isc qualifiers). Mappings are memoized per header signature, so every
+file from the same EPC template resolves once.
+"""
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from core.gazetteer import normalize_name
+
+# canonical field -> accepted header aliases (English / Arabic)
+BOM_SCHEMA = {
+    "voc_stc": [
+        "Voc_STC",
+        "Voc",
+        "Module_Voc",
+        "PV_Voc",
+        "Open circuit voltage",
+        "Module open circuit voltage",
+        "جهد الدائرة المفتوحة",
+    ],
+    "temp_coeff": [
+        "TempCoeff",
+        "Temp_Coeff",
+        "Voc_TempCoeff",
+        "TempCoeff_Voc",
+        "Temperature coefficient",
+        "Temperature coefficient of Voc",
+        "Beta Voc",
+        "معامل الحرارة",
+        "معامل درجة الحرارة",
+    ],
+    "modules_per_string": [
+        "ModulesPerString",
+        "Modules_per_string",
+        "MPS",
+        "PanelsPerString",
+        "Modules/string",
+        "String length",
+        "عدد الألواح لكل سلسلة",
+        "الألواح لكل سلسلة",
+    ],
+    "inverter_vmax": [
+        "Inverter_Vmax",
+        "InverterVmax",
+        "DC_Vmax",
+        "Vmax_DC",
+        "Max DC voltage",
+        "Max input voltage",
+        "Inverter max DC voltage",
+        "أقصى جهد مستمر",
+        "أقصى جهد دخل",
+    ],
+    "inverter_name": [
+        "Inverter",
+        "InverterModel",
+        "INV_Model",
+        "Inverter_Model",
+        "العاكس",
+        "طراز العاكس",
+        "المحول",
+    ],
+    "module_model": [
+        "Module",
+        "ModuleModel",
+        "Module_Model",
+        "PV_Module",
+        "Panel",
+        "Panel model",
+        "اللوح",
+        "طراز اللوح",
+        "اللوح الشمسي",
+    ],
+}
+
+FUZZY_MIN_SCORE = 0.86
+
+# fields holding a model / name; count headers ("Modules", "Qty", "No. of
+# inverters") sit next to them in BoMs and must never fuzzy-match onto them
+NAME_FIELDS = ("module_model", "inverter_name")
+COUNT_WORDS = [
+    "qty",
+    "quantity",
+    "count",
+    "no",
+    "nos",
+    "number",
+    "pcs",
+    "total",
+    "modules",
+    "panels",
+    "inverters",
+    "عدد",
+    "كمية",
+]
+
+# qualifier words that flip a quantity's meaning: a fuzzy match must not
+# cross them ("Min DC voltage" is not "Max DC voltage", "Vmp temperature
+# coefficient" is not the Voc one). word -> (group, canonical value)
+QUALIFIER_WORDS = {
+    "min": ("limit", "min"),
+    "minimum": ("limit", "min"),
+    "vmin": ("limit", "min"),
+    "أدنى": ("limit", "min"),
+    "max": ("limit", "max"),
+    "maximum": ("limit", "max"),
+    "vmax": ("limit", "max"),
+    "أقصى": ("limit", "max"),
+    "ac": ("current", "ac"),
+    "vac": ("current", "ac"),
+    "متردد": ("current", "ac"),
+    "dc": ("current", "dc"),
+    "vdc": ("current", "dc"),
+    "مستمر": ("current", "dc"),
+    "voc": ("quantity", "voc"),
+    "vmp": ("quantity", "vmp"),
+    "vmpp": ("quantity", "vmp"),
+    "isc": ("quantity", "isc"),
+    "imp": ("quantity", "imp"),
+    "impp": ("quantity", "imp"),
+    "pmax": ("quantity", "pmax"),
+    "pmpp": ("quantity", "pmax"),
+}
+# what each quantity field means, in those qualifier groups
+FIELD_QUALIFIERS = {
+    "voc_stc": {"quantity": "voc"},
+    "temp_coeff": {"quantity": "voc"},
+    "inverter_vmax": {"limit": "max", "current": "dc"},
+}
+
+_UNITS = re.compile(r"[\(\[\{][^\)\]\}]*[\)\]\}]")
+_TRAILING_UNIT = re.compile(r"\s+(?:v|vdc|kv|%|%/°?c|%/k|°?c|w|kw|a)$")
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+
+def normalize_header(h) -> str:
+    s = _UNITS.sub(" ", str(h))
+    s = normalize_name(s)
+    s = _TRAILING_UNIT.sub("", s)
+    return re.sub(r"\s+", "", s)
+
+
+@lru_cache(maxsize=1)
+def _count_words() -> frozenset:
+    return frozenset(normalize_name(w) for w in COUNT_WORDS)
+
+
+def _header_words(h) -> list:
+    return normalize_name(_CAMEL.sub(" ", _UNITS.sub(" ", str(h)))).split()
+
+
+def is_count_header(h) -> bool:
+    """Quantity column ("Modules", "Inverter Qty", "NoOfPanels", "عدد الألواح")."""
+    return not _count_words().isdisjoint(_header_words(h))
+
+
+@lru_cache(maxsize=1)
+def _qualifier_words() -> Dict[str, Tuple[str, str]]:
+    return {normalize_name(w): q for w, q in QUALIFIER_WORDS.items()}
+
+
+def conflicting_fields(h) -> frozenset:
+    """Fields whose min/max, AC/DC or Voc/Vmp/Isc… qualifier the header contradicts."""
+    quals = [_qualifier_words().get(w) for w in _header_words(h)]
+    quals = [q for q in quals if q]
+    return frozenset(
+        f
+        for f, want in FIELD_QUALIFIERS.items()
+        if any(g in want and want[g] != v for g, v in quals)
+    )
+
+
+@lru_cache(maxsize=1)
+def _alias_index() -> Dict[str, Tuple[str, int]]:
+    # normalized alias -> (field, priority); earlier aliases win ties
+    idx = {normalize_header(f): (f, -1) for f in BOM_SCHEMA}
+    for f, aliases in BOM_SCHEMA.items():
+        for rank, a in enumerate(aliases):
+            idx.setdefault(normalize_header(a), (f, rank))
+    return idx
+
+
+@lru_cache(maxsize=256)
+def _resolve(headers: Tuple[str, ...]) -> Tuple[Tuple[str, Optional[int]], ...]:
+    aliases = _alias_index()
+    keys = [normalize_header(h) for h in headers]
+
+    # exact alias hits; the highest-priority alias wins per field
+    best: Dict[str, Tuple[int, int]] = {}
+    for i, k in enumerate(keys):
+        if k in aliases:
+            f, rank = aliases[k]
+            if f not in best or rank < best[f][0]:
+                best[f] = (rank, i)
+    found = {f: i for f, (_, i) in best.items()}
+
+    # fuzzy for what is left, best scores first
+    taken = set(found.values())
+    scored = []
+    for i, k in enumerate(keys):
+        if i in taken or not k:
+            continue
+        counts = is_count_header(headers[i])
+        conflicts = conflicting_fields(headers[i])
+        for a, (f, _) in aliases.items():
+            if f in found or f in conflicts or (counts and f in NAME_FIELDS):
+                continue
+            score = SequenceMatcher(None, k, a).ratio()
+            if score >= FUZZY_MIN_SCORE:
+                scored.append((score, i, f))
+    for _, i, f in sorted(scored, reverse=True):
+        if f not in found and i not in taken:
+            found[f] = i
+            taken.add(i)
+
+    return tuple((f, found.get(f)) for f in BOM_SCHEMA)
+
+
+def resolve_columns(columns: Iterable) -> Dict[str, Optional[object]]:
+    """Canonical field -> original column label (or None if absent)."""
+    cols = list(columns)
+    mapping = _resolve(tuple(str(c) for c in cols))
+    return {f: (cols[i] if i is not None else None) for f, i in mapping}
@@ -0,0 +1,149 @@
+"""
+Catalog-wide string sizing.
+
+Precomputes min/max modules per string for every module x inverter x Tmin
+bin as int16 NumPy tables, so what-if queries are plain array reads.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.catalog import TABLES, all_inverters, lookup_inverter, normalize_model
+
+# design Tmin bins (°C); lookups round down to the colder bin
+TMIN_BINS = np.arange(-30, 31, 1, dtype=np.int16)
+# hot-side cell temperature for the MPPT minimum check
+T_CELL_HOT_C = 70.0
+
+
+@dataclass
+class SizingTable:
+    modules: List[str]
+    inverters: List[str]
+    tmin_bins: np.ndarray
+    # (modules, inverters, bins); min is 1 where MPPT/Vmp data is missing
+    min_mps: np.ndarray
+    max_mps: np.ndarray
+    _module_idx: Dict[str, int] = field(init=False, repr=False)
+    _inverter_idx: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._module_idx = {k: i for i, k in enumerate(self.modules)}
+        self._inverter_idx = {k: i for i, k in enumerate(self.inverters)}
+
+    def _bin(self, tmin: float) -> int:
+        i = int(np.floor(float(tmin))) - int(self.tmin_bins[0])
+        return min(max(i, 0), len(self.tmin_bins) - 1)
+
+    def lookup(self, module: str, inverter: str, tmin: float) -> Tuple[int, int]:
+        m = self._module_idx[module]
+        i = self._inverter_idx[inverter]
+        t = self._bin(tmin)
+        return int(self.min_mps[m, i, t]), int(self.max_mps[m, i, t])
+
+    def fits(self, module: str, tmin: float) -> pd.DataFrame:
+        """Inverters that accept at least one string length of this module."""
+        m = self._module_idx[module]
+        t = self._bin(tmin)
+        lo, hi = self.min_mps[m, :, t], self.max_mps[m, :, t]
+        out = pd.DataFrame(
+            {
+                "inverter": self.inverters,
+                "min_modules_per_string": lo,
+                "max_modules_per_string": hi,
+            }
+        )
+        return out[(hi >= lo) & (hi >= 1)].reset_index(drop=True)
+
+
+def _col(df: pd.DataFrame, name: str, default=np.nan) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), default, dtype="float64")
+    return pd.to_numeric(df[name], errors="coerce").to_numpy("float64")
+
+
+def build_sizing_table(
+    modules: pd.DataFrame,
+    inverters: pd.DataFrame,
+    tmin_bins: np.ndarray = TMIN_BINS,
+    t_cell_hot: float = T_CELL_HOT_C,
+) -> SizingTable:
+    """
+    modules:   model, voc_stc, temp_coeff [, vmp_stc, vmp_temp_coeff]
+    inverters: model, vdc_max [, mppt_vmin]
+    Coefficients are per °C (fractions); percentages are normalized.
+    """
+    voc = _col(modules, "voc_stc")
+    tc = np.abs(_col(modules, "temp_coeff"))
+    tc = np.where(tc > 0.05, tc / 100.0, tc)
+    vmp = _col(modules, "vmp_stc")
+    tc_vmp = np.abs(_col(modules, "vmp_temp_coeff", -0.0035))
+    tc_vmp = np.where(np.isnan(tc_vmp), 0.0035, tc_vmp)
+    tc_vmp = np.where(tc_vmp > 0.05, tc_vmp / 100.0, tc_vmp)
+
+    vdc = _col(inverters, "vdc_max")
+    vmin = _col(inverters, "mppt_vmin")
+
+    bins = np.asarray(tmin_bins, dtype="float64")
+    # (M, T) module Voc at each Tmin bin
+    voc_cold = voc[:, None] * (1.0 + tc[:, None] * (25.0 - bins[None, :]))
+    # (M, I, T)
+    max_mps = np.floor(vdc[None, :, None] / voc_cold[:, None, :])
+
+    # (M,) hot Vmp; (M, I) min modules to stay above the MPPT window
+    vmp_hot = vmp * (1.0 - tc_vmp * (t_cell_hot - 25.0))
+    min_mps = np.ceil(vmin[None, :] / vmp_hot[:, None])
+    min_mps = np.where(np.isfinite(min_mps), np.maximum(min_mps, 1), 1)
+    min_mps = np.broadcast_to(min_mps[:, :, None], max_mps.shape)
+
+    max_mps = np.where(np.isfinite(max_mps), max_mps, 0)
+    return SizingTable(
+        modules=[str(x) for x in modules["model"]],
+        inverters=[str(x) for x in inverters["model"]],
+        tmin_bins=np.asarray(tmin_bins, dtype=np.int16),
+        min_mps=min_mps.astype(np.int16),
+        max_mps=max_mps.astype(np.int16),
+    )
+
+
+def module_label(voc_stc: float, temp_coeff: float) -> str:
+    return f"Voc {voc_stc:.1f} V, {temp_coeff * 100:+.2f} %/°C"
+
+
+def tables_from_strings(strings: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Module and inverter tables from an extract_bom_strings() frame.
+    Modules are the BoM's; inverters are the BoM's plus every catalog
+    inverter with a DC max, so the what-if can suggest alternatives.
+    """
+    mods = strings[["voc_stc", "temp_coeff"]].drop_duplicates().reset_index(drop=True)
+    mods.insert(
+        0,
+        "model",
+        [module_label(v, t) for v, t in zip(mods["voc_stc"], mods["temp_coeff"])],
+    )
+    invs = (
+        strings[["inverter_name", "inverter_vmax"]]
+        .drop_duplicates("inverter_name")
+        .rename(columns={"inverter_name": "model", "inverter_vmax": "vdc_max"})
+        .reset_index(drop=True)
+    )
+    # MPPT window from the datasheet catalog when the inverter is known there
+    recs = [lookup_inverter(m) or {} for m in invs["model"]]
+    invs["mppt_vmin"] = [r.get("mppt_vmin") for r in recs]
+    # the rest of the catalog; BoM inverters (and their matches) appear once
+    seen = set(invs["model"].map(normalize_model)) | {r.get("model_key") for r in recs}
+    cat = pd.DataFrame(all_inverters(), columns=["model_key"] + TABLES["inverters"])
+    cat = cat[cat["vdc_max"].notna() & ~cat["model_key"].isin(seen)]
+    invs = pd.concat([invs, cat[["model", "vdc_max", "mppt_vmin"]]], ignore_index=True)
+    return mods, invs
+
+
+def design_t_cell_hot(tmax: Optional[float], noct: float = 45.0) -> float:
+    """Hot-side cell temperature from the site's design Tmax at 1000 W/m²."""
+    if tmax is None:
+        return T_CELL_HOT_C
+    return float(tmax) + (noct - 20.0) / 800.0 * 1000.0
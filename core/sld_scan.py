@@ -0,0 +1,241 @@
+"""
+Page-streaming SLD text scanner.
+
+Every keyword of every signal in core.sld_signals is compiled once into a
+single Aho-Corasick automaton, so a page is scanned in one linear pass
+however many signals are registered; each keyword hit only parses the
+short window next to it. Pages are pulled lazily and scanning stops as
+soon as every target signal (by default the ones the review reads) has
+been found; each value is reported with the (1-based) page it came from.
+Large PDFs are extracted in page shards on the shared worker pool
+(core.workers).
+"""
+
+import re
+from collections import deque
+from concurrent.futures import wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.pdf_backends import backend_name, open_pdf
+from core.sld_signals import AFTER, REVIEW_SIGNALS, SLD_SIGNALS
+from core.workers import WORKERS, process_pool, reset_pool
+
+# characters of text a value pattern may look at next to its keyword
+WINDOW = 48
+# page extraction moves to worker processes from this page count
+PARALLEL_MIN_PAGES = 24
+SHARD_PAGES = 8
+
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_SLASH = re.compile(r"\s*/\s*")
+
+
+def normalize_text(text: str) -> str:
+    """Lower case, single spaces (newlines kept), no spaces around '/'."""
+    return _SLASH.sub("/", _SPACES.sub(" ", text.lower()))
+
+
+def _variants(keyword: str) -> List[str]:
+    k = normalize_text(keyword)
+    # "dc max" also matches "DCMAX" on drawings
+    return [k, k.replace(" ", "")] if " " in k else [k]
+
+
+def build_automaton(keywords: List[str]) -> Tuple[List[Dict], List[int], List[List]]:
+    """Aho-Corasick goto/fail/output tables; outputs index into keywords."""
+    goto: List[Dict[str, int]] = [{}]
+    out: List[List[int]] = [[]]
+    for i, kw in enumerate(keywords):
+        s = 0
+        for ch in kw:
+            if ch not in goto[s]:
+                goto[s][ch] = len(goto)
+                goto.append({})
+                out.append([])
+            s = goto[s][ch]
+        out[s].append(i)
+
+    fail = [0] * len(goto)
+    queue = list(goto[0].values())
+    for s in queue:  # breadth first; the queue grows while iterating
+        for ch, nxt in goto[s].items():
+            queue.append(nxt)
+            f = fail[s]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0) if s else 0
+            out[nxt] = out[nxt] + out[fail[nxt]]
+    return goto, fail, out
+
+
+def find_keywords(automaton, text: str) -> Iterator[Tuple[int, int]]:
+    """(keyword index, end offset) for every hit, in one pass over text."""
+    goto, fail, out = automaton
+    s = 0
+    for pos, ch in enumerate(text):
+        while s and ch not in goto[s]:
+            s = fail[s]
+        s = goto[s].get(ch, 0)
+        for i in out[s]:
+            yield i, pos + 1
+
+
+_compiled: Dict[int, Tuple] = {}
+
+
+def _compile(signals: Dict) -> Tuple:
+    """
+    (registry, keywords, rules per keyword, automaton), cached per registry.
+    Rules are (signal, rank, side, compiled value pattern).
+    """
+    hit = _compiled.get(id(signals))
+    if hit is not None and hit[0] is signals:
+        return hit
+
+    keywords: List[str] = []
+    rules: List[List[Tuple]] = []
+    index: Dict[str, int] = {}
+    for name, spec in signals.items():
+        for rank, (kws, side, pattern) in enumerate(spec["rules"]):
+            rx = re.compile(pattern)
+            for kw in kws:
+                for v in _variants(kw):
+                    if v not in index:
+                        index[v] = len(keywords)
+                        keywords.append(v)
+                        rules.append([])
+                    rules[index[v]].append((name, rank, side, rx))
+    hit = (signals, keywords, rules, build_automaton(keywords))
+    _compiled[id(signals)] = hit
+    return hit
+
+
+def scan_text(text: str, signals: Optional[Dict] = None) -> Dict[str, object]:
+    """
+    Every signal found in one page of text. The higher-priority rule wins,
+    then the earliest hit.
+    """
+    registry, keywords, rules, automaton = _compile(signals or SLD_SIGNALS)
+    text = normalize_text(text)
+    n = len(text)
+    best: Dict[str, Tuple[int, object]] = {}
+    for i, end in find_keywords(automaton, text):
+        start = end - len(keywords[i])
+        # keywords match whole words: no letters glued on either side
+        if (start and text[start - 1].isalpha()) or (end < n and text[end].isalpha()):
+            continue
+        for name, rank, side, rx in rules[i]:
+            if name in best and best[name][0] <= rank:
+                continue
+            if side == AFTER:
+                m = rx.match(text, end, min(n, end + WINDOW))
+            else:
+                m = rx.search(text, max(0, start - WINDOW), start)
+            if m is None:
+                continue
+            try:
+                best[name] = (rank, registry[name]["parse"](m.group(1)))
+            except ValueError:
+                continue
+    return {name: value for name, (_, value) in best.items()}
+
+
+def _extract_range(
+    shm_name: str, size: int, start: int, stop: int, backend: str
+) -> List[str]:
+    """Worker: text of pages [start, stop) of the PDF held in shared memory."""
+    # attach only: the parent unlinks (workers share its resource tracker)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _, page_text = open_pdf(bytes(shm.buf[:size]), backend)
+        return [page_text(i) for i in range(start, stop)]
+    finally:
+        shm.close()
+
+
+def _iter_parallel(pool, pdf_bytes: bytes, n_pages: int, backend: str) -> Iterator[str]:
+    """
+    Shards of SHARD_PAGES pages go to the worker pool, a bounded number
+    ahead of the consumer; texts come back in page order. The PDF is
+    shared once through shared memory instead of being pickled per task.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(pdf_bytes)))
+    shm.buf[: len(pdf_bytes)] = pdf_bytes
+    shards = [
+        (s, min(s + SHARD_PAGES, n_pages)) for s in range(0, n_pages, SHARD_PAGES)
+    ]
+    pending: deque = deque()
+    try:
+        for start, stop in shards:
+            pending.append(
+                pool.submit(
+                    _extract_range, shm.name, len(pdf_bytes), start, stop, backend
+                )
+            )
+            if len(pending) >= 2 * WORKERS:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # early exit: drop shards not started yet, wait out the running ones
+        for fut in pending:
+            fut.cancel()
+        wait(pending)
+        shm.close()
+        shm.unlink()
+
+
+def iter_page_texts(pdf_bytes: bytes, backend: Optional[str] = None) -> Iterator[str]:
+    """
+    Text of each page in order, extracted only as the consumer asks, with
+    the configured core.pdf_backends backend. Large PDFs
+    (PARALLEL_MIN_PAGES and up) are sharded over the worker pool.
+    """
+    backend = backend_name(backend)
+    n_pages, page_text = open_pdf(pdf_bytes, backend)
+    done = 0
+    pool = process_pool() if n_pages >= PARALLEL_MIN_PAGES else None
+    if pool is not None:
+        try:
+            for text in _iter_parallel(pool, pdf_bytes, n_pages, backend):
+                done += 1
+                yield text
+            return
+        except BrokenProcessPool:
+            reset_pool(pool)  # finish in process from the first missing page
+        except OSError:
+            pass
+
+    for i in range(done, n_pages):
+        yield page_text(i)
+
+
+def scan_pages(
+    pages: Iterable[str],
+    signals: Optional[Dict] = None,
+    targets: Optional[Iterable[str]] = None,
+) -> Tuple[Dict[str, Tuple[object, int]], int, bool]:
+    """
+    Returns ({signal: (value, page)}, pages scanned, any text seen).
+    The earliest page wins. Stops once every target is found (default:
+    REVIEW_SIGNALS, or every signal of a custom registry); other signals
+    are still reported from the pages scanned.
+    """
+    if targets is None:
+        targets = REVIEW_SIGNALS if signals is None else signals
+    targets = set(targets)
+    found: Dict[str, Tuple[object, int]] = {}
+    scanned = 0
+    has_text = False
+    for page_no, text in enumerate(pages, start=1):
+        scanned = page_no
+        if not text.strip():
+            continue
+        has_text = True
+        for name, value in scan_text(text, signals).items():
+            found.setdefault(name, (value, page_no))
+        if targets <= found.keys():
+            break  # early exit: later pages are never extracted
+    return found, scanned, has_text
@@ -0,0 +1,208 @@
+"""
+Declarative SLD signal registry.
+
+Each signal lists rules in priority order: keywords (lower case, matched
+on letter boundaries against normalized page text), the side of the
+keyword where the value sits, and a value pattern applied to a short
+window on that side ("after" patterns are anchored at the keyword end,
+"before" patterns at the keyword start). core.sld_scan compiles every
+keyword of every signal into one Aho-Corasick automaton.
+"""
+
+AFTER = "after"
+BEFORE = "before"
+
+# value sits right after "<keyword>[:=]"
+_SEP = r"\s*(?:\(\w+\)\s*)?[:=]?\s*"
+# value somewhere in the next few words (ratings written as "... 16 A gPV")
+_NEAR = r"[^\n]{0,30}?"
+
+_NUM = r"(\d+(?:[.,]\d+)?)"
+_INT = r"(\d{1,4})"
+_MM2 = r"\s*(?:mm2|mm²|sq\.?\s*mm|sqmm)"
+_SPD = r"(?:type|t)\s*([123](?:\s*\+\s*(?:type\s*|t)?[123])?)"
+
+
+def _float(v: str) -> float:
+    return float(v.replace(",", "."))
+
+
+def _spd(v: str) -> str:
+    return "+".join(f"T{d}" for d in sorted(set(c for c in v if c in "123")))
+
+
+SLD_SIGNALS = {
+    "inverter_vmax": {
+        "parse": _float,
+        "rules": [
+            (
+                [
+                    "dc max",
+                    "dc maximum",
+                    "vdc max",
+                    "v max",
+                    "max dc",
+                    "udc max",
+                    "udc maximum",
+                ],
+                AFTER,
+                _SEP + r"(\d{3,4})\s*v",
+            ),
+            (["vmax"], AFTER, _SEP + r"(\d{3,4})\s*v"),
+            (["dc max", "vdc max", "max dc"], BEFORE, r"(\d{3,4})\s*v\s*$"),
+            # unit glued to the number: "1500VDC MAX"
+            (["vdc max"], BEFORE, r"(\d{3,4})\s*$"),
+        ],
+    },
+    "modules_per_string": {
+        "parse": int,
+        "rules": [
+            (
+                ["modules/string", "modules per string", "mod/str"],
+                AFTER,
+                _SEP + r"(\d{1,3})",
+            ),
+            (["mps"], AFTER, _SEP + r"(\d{1,3})"),
+            (["string"], AFTER, _SEP + r"(\d{1,3})\s*(?:modules|mod)"),
+        ],
+    },
+    "strings_per_mppt": {
+        "parse": int,
+        "rules": [
+            (["strings per mppt", "strings/mppt"], AFTER, _SEP + r"(\d{1,2})\b"),
+            (["strings per mppt", "strings/mppt"], BEFORE, r"(\d{1,2})\s*$"),
+        ],
+    },
+    "string_count": {
+        "parse": int,
+        "rules": [
+            (
+                ["no. of strings", "number of strings", "total strings", "strings qty"],
+                AFTER,
+                _SEP + _INT + r"\b",
+            ),
+            (["strings in total", "strings total"], BEFORE, _INT + r"\s*$"),
+        ],
+    },
+    "mppt_count": {
+        "parse": int,
+        "rules": [
+            (
+                ["no. of mppt", "number of mppt", "mppt count", "mppt qty", "mppts"],
+                AFTER,
+                _SEP + r"(\d{1,2})\b(?![.,]\d|\s*[va]\b)",
+            ),
+            (["mppt", "mppts", "mppt inputs"], BEFORE, r"(\d{1,2})\s*(?:x\s*)?$"),
+        ],
+    },
+    "inverter_count": {
+        "parse": int,
+        "rules": [
+            (
+                ["no. of inverters", "number of inverters", "inverter qty"],
+                AFTER,
+                _SEP + r"(\d{1,3})\b",
+            ),
+            (["inverters"], BEFORE, r"(\d{1,3})\s*(?:x\s*)?$"),
+        ],
+    },
+    "inverter_ac_kw": {
+        "parse": _float,
+        "rules": [
+            (
+                ["ac output", "rated ac power", "rated power", "ac power"],
+                AFTER,
+                _NEAR + _NUM + r"\s*kw",
+            ),
+        ],
+    },
+    "module_voc": {
+        "parse": _float,
+        "rules": [(["voc"], AFTER, _SEP + r"(\d{2,3}(?:[.,]\d+)?)\s*v")],
+    },
+    "module_isc": {
+        "parse": _float,
+        "rules": [(["isc"], AFTER, _SEP + r"(\d{1,2}(?:[.,]\d+)?)\s*a\b")],
+    },
+    "module_imp": {
+        "parse": _float,
+        "rules": [(["imp", "impp"], AFTER, _SEP + r"(\d{1,2}(?:[.,]\d+)?)\s*a\b")],
+    },
+    "dc_cable_mm2": {
+        "parse": _float,
+        "rules": [
+            (
+                ["dc cable", "pv cable", "solar cable", "string cable", "dc cables"],
+                AFTER,
+                _NEAR + r"(?:\d+\s*[x×]\s*)?" + _NUM + _MM2,
+            ),
+        ],
+    },
+    "earthing_mm2": {
+        "parse": _float,
+        "rules": [
+            (
+                ["earthing", "earth conductor", "pe conductor", "grounding"],
+                AFTER,
+                _NEAR + r"(?:\d+\s*[x×]\s*)?" + _NUM + _MM2,
+            ),
+        ],
+    },
+    "fuse_rating_a": {
+        "parse": int,
+        "rules": [
+            (
+                ["string fuse", "gpv fuse", "fuse", "fuses"],
+                AFTER,
+                _NEAR + _INT + r"\s*a\b",
+            ),
+            (["gpv", "fuse"], BEFORE, _INT + r"\s*a\s*$"),
+        ],
+    },
+    "breaker_rating_a": {
+        "parse": int,
+        "rules": [
+            (
+                ["mccb", "mcb", "acb", "circuit breaker", "breaker"],
+                AFTER,
+                _NEAR + _INT + r"\s*a\b",
+            ),
+            (
+                ["mccb", "mcb", "acb", "breaker"],
+                BEFORE,
+                _INT + r"\s*a\s*(?:\dp\s*|\d\s*pole\s*)?$",
+            ),
+        ],
+    },
+    "dc_isolator_a": {
+        "parse": int,
+        "rules": [
+            (
+                ["dc isolator", "dc switch", "dc disconnect", "isolator"],
+                AFTER,
+                _NEAR + _INT + r"\s*a\b",
+            ),
+        ],
+    },
+    "spd_type": {
+        "parse": _spd,
+        "rules": [
+            (
+                [
+                    "spd",
+                    "surge protection",
+                    "surge protective device",
+                    "surge arrester",
+                ],
+                AFTER,
+                _NEAR + _SPD,
+            ),
+            (["spd", "surge arrester"], BEFORE, _SPD + r"\s*(?:dc\s*|ac\s*)?$"),
+        ],
+    },
+}
+
+# what the Stage 2 checks read from the SLD (compare_bom_vs_sld); page
+# scanning stops once these are found unless a caller asks for more
+# (core.sld_scan.scan_pages targets)
+REVIEW_SIGNALS = ("inverter_vmax", "modules_per_string")
@@ -1,12 +1,8 @@
+import pandas as pd
 import streamlit as st
-from core.report import generate_sanad_report, now_date_str
-from core.review import (
-    climate_voltage_check,
-    compare_bom_vs_sld,
-    extract_bom_signals,
-    saudi_standards_snapshot,
-    try_extract_from_sld,
-)
+from core.pipeline import run_review
+from core.report import now_date_str, report_future
+from core.weather import design_years
 
 def _inject_css():
     st.markdown(
@@ -196,35 +192,79 @@ def render_stage2():
         st.error("Missing inputs. Complete Stage 1 first.")
         return
 
-    # signals
-    bom_sig = extract_bom_signals(bom_df)
-    sld_sig = try_extract_from_sld(sld_bytes)
-
-    # 1) BoM vs SLD
-    doc = compare_bom_vs_sld(bom_sig, sld_sig)
+    # memoized per input fingerprint: unchanged reruns are cache lookups
+    profile = st.session_state.get("climate_profile")
+    r = run_review(bom_df, sld_bytes, float(tmin), profile)
+    bom_issues, doc, doc_level = r["bom_issues"], r["doc"], r["doc_level"]
+    climate, numbers, recs = r["climate"], r["numbers"], r["recs"]
+    strings, n_fail, sizing = r["strings"], r["n_fail"], r["sizing"]
+    compliant, gaps = r["compliant"], r["gaps"]
+
+    # the PDF builds in the background while the rest of the page renders
+    report = report_future(
+        {
+            "project_name": "SANAD",
+            "place": st.session_state.get("place", "-"),
+            "date_str": now_date_str(),
+            "numbers": numbers,
+            "bom_status": doc_level,
+            "climate_status": climate.level,
+            "compliant": compliant,
+            "gaps": gaps,
+            "recommendations": recs,
+        }
+    )
 
-    # per your requirement: INFO -> treat as PASS
-    doc_level = (doc.level or "PASS").upper()
-    if doc_level == "INFO":
-        doc_level = "PASS"
+    # rejected cells fell back to catalog/defaults
+    if not bom_issues.empty:
+        per_field = bom_issues["field"].value_counts()
+        render_card(
+            title="BoM data validation",
+            subtitle="Cells that could not be used as given were replaced by catalog or default values.",
+            level="WARN",
+            bullets=[
+                f"{len(bom_issues)} value(s) rejected in "
+                f"{bom_issues['row'].nunique()} row(s).",
+            ]
+            + [f"{field}: {n}" for field, n in per_field.items()],
+        )
+        with st.expander("BoM issues"):
+            st.dataframe(
+                bom_issues.dropna(axis=1, how="all"),
+                use_container_width=True,
+                hide_index=True,
+            )
+        st.markdown('<div class="section-gap"></div>', unsafe_allow_html=True)
 
+    # 1) BoM vs SLD
     render_card(
         title="BoM vs SLD consistency",
         subtitle="Verifies whether the SLD drawing aligns with BoM key electrical values.",
         level=doc_level,
         bullets=doc.details,
     )
+    sld = r["sld"]
+    if sld.get("signals"):
+        with st.expander(f"SLD signals ({len(sld['signals'])} detected)"):
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {"signal": k, "value": str(v), "page": sld["pages"].get(k)}
+                        for k, v in sld["signals"].items()
+                    ]
+                ),
+                use_container_width=True,
+                hide_index=True,
+            )
 
     st.markdown('<div class="section-gap"></div>', unsafe_allow_html=True)
 
     # 2) Climate check
-    climate, numbers, recs = climate_voltage_check(bom_sig, float(tmin))
-
     render_kpis(
         [
             ("Inverter DC max", f"{numbers['Inverter_DC_max_V']:.0f} V"),
             ("Modules / string", f"{numbers['Modules_per_string']}"),
-            ("Lowest temp (10y)", f"{numbers['Tmin_C']:.0f} °C"),
+            (f"Lowest temp ({design_years()}y)", f"{numbers['Tmin_C']:.0f} °C"),
             ("String Voc @ Tmin", f"{numbers['String_Voc_at_Tmin_V']:.0f} V"),
         ]
     )
@@ -233,17 +273,53 @@ def render_stage2():
         title="Cold weather overvoltage risk",
         subtitle="Checks PV string voltage at minimum historical temperature.",
         level=climate.level,
-        bullets=(climate.details + (recs or [])),
+        bullets=(climate.details + recs),
     )
 
+    # every string in the BoM, each against its own inverter
+    if len(strings) > 1:
+        checked = strings[strings["status"] != "UNKNOWN"]
+        n_unknown = len(strings) - len(checked)
+        st.markdown('<div class="section-gap"></div>', unsafe_allow_html=True)
+        render_card(
+            title="Per-string overvoltage (all BoM strings)",
+            subtitle="Every string row checked against its inverter's DC max.",
+            level=("FAIL" if n_fail else "WARN" if n_unknown else "PASS"),
+            bullets=[
+                f"{len(strings) - n_fail - n_unknown} of {len(strings)} strings "
+                "within inverter DC max at Tmin.",
+                f"Worst margin: {checked['margin_V'].min():.0f} V.",
+            ]
+            + (
+                [f"{n_unknown} string(s) not verified: modules/string rejected."]
+                if n_unknown
+                else []
+            ),
+        )
+        with st.expander("Per-string results"):
+            st.dataframe(strings, use_container_width=True, hide_index=True)
+
+    # what-if: which BoM inverters fit each module, at what string lengths
+    with st.expander("String sizing what-if"):
+        w1, w2 = st.columns([1.3, 0.7])
+        with w1:
+            module = st.selectbox("Module", sizing.modules, key="whatif_module")
+        with w2:
+            lo, hi = int(sizing.tmin_bins[0]), int(sizing.tmin_bins[-1])
+            t_what = st.slider(
+                "Tmin (°C)",
+                lo,
+                hi,
+                int(min(max(float(tmin), lo), hi)),
+                key="whatif_tmin",
+            )
+        st.dataframe(
+            sizing.fits(module, t_what), use_container_width=True, hide_index=True
+        )
+
     st.markdown('<div class="section-gap"></div>', unsafe_allow_html=True)
 
     # 3) Standards snapshot
-    compliant, gaps = saudi_standards_snapshot(
-        climate_ok=(climate.level == "PASS"),
-        bom_sld_level=doc_level,
-    )
-
     c1, c2 = st.columns([1, 1], gap="large")
     with c1:
         render_card(
@@ -264,19 +340,12 @@ def render_stage2():
     st.markdown('<div class="sg-divider"></div>', unsafe_allow_html=True)
     st.markdown('<div class="stage2-title">Export report</div>', unsafe_allow_html=True)
 
-    payload = {
-        "project_name": "SANAD",
-        "place": st.session_state.get("place", "-"),
-        "date_str": now_date_str(),
-        "numbers": numbers,
-        "bom_status": doc_level,
-        "climate_status": climate.level,
-        "compliant": compliant,
-        "gaps": gaps,
-        "recommendations": (recs or []),
-    }
-
-    pdf = generate_sanad_report(payload)
+    try:
+        with st.spinner("Building report…"):
+            pdf = report.result()
+    except Exception as e:
+        st.error(f"Report generation failed: {e}")
+        return
 
     st.download_button(
         "Download SANAD report (PDF)",
@@ -12,17 +12,23 @@ def init_state():
     st.session_state.setdefault("current_temp", None)
     st.session_state.setdefault("tmin", None)
     st.session_state.setdefault("tmin_method", None)
+    st.session_state.setdefault("climate_profile", None)
 
     st.session_state.setdefault("sld_pdf_name", None)
     st.session_state.setdefault("sld_pdf_bytes", None)
+    st.session_state.setdefault("sld_fp", None)
 
     st.session_state.setdefault("bom_df", None)
     st.session_state.setdefault("bom_name", None)
+    st.session_state.setdefault("bom_fp", None)
+    st.session_state.setdefault("bom_error", None)
 
 
 def reset_all():
     for k in [
         "stage",
+        "geo_pick",
+        "geo_query",
         "geo_results",
         "place",
         "lat",
@@ -30,10 +36,14 @@ def reset_all():
         "current_temp",
         "tmin",
         "tmin_method",
+        "climate_profile",
         "sld_pdf_name",
         "sld_pdf_bytes",
+        "sld_fp",
         "bom_df",
         "bom_name",
+        "bom_fp",
+        "bom_error",
     ]:
         if k in st.session_state:
             del st.session_state[k]
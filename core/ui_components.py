@@ -61,7 +61,7 @@ def render_map(
     components.html(html, height=height, scrolling=False)
 
 
-def weather_summary(place, current_temp, tmin, method):
+def weather_summary(place, current_temp, tmin, method, years: int = 10):
     place_txt = place or "—"
     ct = "—" if current_temp is None else f"{float(current_temp):.1f}"
     tm = "—" if tmin is None else f"{float(tmin):.0f}"
@@ -75,7 +75,7 @@ def weather_summary(place, current_temp, tmin, method):
               <div class="sg-temp">{ct}<span class="sg-unit">°C</span></div>
             </div>
             <div style="text-align:right;">
-              <div class="sg-label">Lowest temperature last 10Y</div>
+              <div class="sg-label">Lowest temperature last {years}Y</div>
               <div class="sg-temp">{tm}<span class="sg-unit">°C</span></div>
             </div>
           </div>
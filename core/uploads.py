@@ -0,0 +1,37 @@
+"""
+Upload change detection.
+
+Streamlit hands back the same UploadedFile on every rerun. The cheap check
+is file_id + size; only when that changes is the content hashed
+(incrementally, no full copy) so re-uploading identical bytes is still a
+no-op. Callers parse only when upload_changed() returns True.
+"""
+
+import hashlib
+
+import streamlit as st
+
+CHUNK_BYTES = 1 << 20
+
+
+def fingerprint(f, chunk: int = CHUNK_BYTES) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    for block in iter(lambda: f.read(chunk), b""):
+        h.update(block)
+    f.seek(0)
+    return h.hexdigest()
+
+
+def upload_changed(f, key: str) -> bool:
+    """
+    True when f differs from the upload last recorded under session key
+    `key` (e.g. "bom_fp"); records the new fingerprint.
+    """
+    ident = (getattr(f, "file_id", None) or f.name, f.size)
+    seen = st.session_state.get(key)
+    if seen is not None and seen["id"] == ident:
+        return False
+    fp = fingerprint(f)
+    st.session_state[key] = {"id": ident, "hash": fp}
+    return seen is None or seen["hash"] != fp
@@ -1,33 +1,120 @@
+import argparse
 import math
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 
-import pandas as pd
-import requests
+from core.climate_cache import (
+    blob_get,
+    blob_put,
+    cache_get,
+    cache_put,
+    cell_id,
+    series_put,
+    series_range,
+    series_sites,
+    series_values,
+    site_neighbours,
+    site_put,
+    tmin_key,
+)
+from core.climate_profile import (
+    SiteClimateProfile,
+    build_profile,
+    profile_request_params,
+    profile_window,
+)
+from core.gazetteer import search_places
+from core.http_client import get_json
+from core.quantile import HistogramSketch
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+DESIGN_WINDOWS = (10, 20, 30)
+
+# reuse an already-resolved site within this distance / elevation difference
+NEIGHBOUR_RADIUS_KM = 5.0
+NEIGHBOUR_ELEV_TOL_M = 50.0
+
+# shared by all sessions; site lookups are I/O bound
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sanad-climate")
+# separate pool for archive chunks so site lookups never wait on themselves
+_chunk_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="sanad-archive")
+
+
+def offline_mode() -> bool:
+    """SANAD_OFFLINE=1: answer from local datasets only, never touch the network."""
+    return os.environ.get("SANAD_OFFLINE", "").strip().lower() in ("1", "true", "yes")
+
+
+def design_years() -> int:
+    """Design window in years (SANAD_DESIGN_YEARS: 10, 20 or 30; default 10)."""
+    try:
+        years = int(os.environ.get("SANAD_DESIGN_YEARS", "10"))
+    except ValueError:
+        return 10
+    return years if years in DESIGN_WINDOWS else 10
 
 
 def geocode_list(query: str, count: int = 5):
+    """Local gazetteer first (instant); the geocoding API only on a miss."""
+    hits = search_places(query, count=count)
+    if hits or offline_mode():
+        return hits
+
     url = "https://geocoding-api.open-meteo.com/v1/search"
     params = {"name": query, "count": count, "language": "en", "format": "json"}
-    r = requests.get(url, params=params, timeout=12)
-    r.raise_for_status()
-    data = r.json()
+    data = get_json("geocoding", url, params)
     return data.get("results", []) or []
 
 
 def fetch_current_temp(lat: float, lon: float):
+    if offline_mode():
+        return None
     url = "https://api.open-meteo.com/v1/forecast"
     params = {"latitude": lat, "longitude": lon, "current_weather": True}
-    r = requests.get(url, params=params, timeout=12)
-    r.raise_for_status()
-    data = r.json()
+    data = get_json("forecast", url, params)
     return (data.get("current_weather") or {}).get("temperature")
 
 
-def fetch_design_tmin(lat: float, lon: float, years: int = 10):
-    end_d = date.today()
-    start_d = end_d - timedelta(days=365 * years)
+@lru_cache(maxsize=4096)
+def fetch_elevation(lat: float, lon: float) -> Optional[float]:
+    url = "https://api.open-meteo.com/v1/elevation"
+    data = get_json("elevation", url, {"latitude": lat, "longitude": lon})
+    elev = (data.get("elevation") or [None])[0]
+    return None if elev is None else float(elev)
+
+
+def _pct_label(percentile: float) -> str:
+    p = f"{percentile * 100:g}"
+    if p.endswith("1") and not p.endswith("11"):
+        return p + "st"
+    if p.endswith("2") and not p.endswith("12"):
+        return p + "nd"
+    if p.endswith("3") and not p.endswith("13"):
+        return p + "rd"
+    return p + "th"
+
+
+def _tmin_label(years: int, percentile: float) -> str:
+    return f"{years}y Tmin ({_pct_label(percentile)} percentile, floored)"
+
+
+def _year_chunks(start_d: date, end_d: date) -> List[Tuple[date, date]]:
+    chunks = []
+    cs = start_d
+    while cs <= end_d:
+        ce = min(cs + timedelta(days=364), end_d)
+        chunks.append((cs, ce))
+        cs = ce + timedelta(days=1)
+    return chunks
 
-    url = "https://archive-api.open-meteo.com/v1/archive"
+
+def _fetch_daily_tmin(
+    lat: float, lon: float, start_d: date, end_d: date
+) -> Tuple[List[int], List]:
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -36,18 +123,323 @@ def fetch_design_tmin(lat: float, lon: float, years: int = 10):
         "daily": "temperature_2m_min",
         "timezone": "auto",
     }
+    data = get_json("archive", ARCHIVE_URL, params)
+    daily = data.get("daily", {}) or {}
+    days = [date.fromisoformat(t).toordinal() for t in daily.get("time", []) or []]
+    return days, daily.get("temperature_2m_min", []) or []
+
+
+def _missing_ranges(
+    stored: Optional[Tuple[int, int]], start_d: date, end_d: date
+) -> List[Tuple[date, date]]:
+    if stored is None:
+        return [(start_d, end_d)]
+    first, last = date.fromordinal(stored[0]), date.fromordinal(stored[1])
+    gaps = []
+    if start_d < first:
+        gaps.append((start_d, first - timedelta(days=1)))
+    if last < end_d:
+        gaps.append((last + timedelta(days=1), end_d))
+    return gaps
+
+
+def _window_values(lat: float, lon: float, start_d: date, end_d: date) -> List:
+    """
+    Daily Tmin for the window from the local store, downloading only the days
+    it does not hold yet (in parallel yearly chunks).
+    """
+    cell = cell_id(lat, lon)
+    chunks = [
+        c
+        for gs, ge in _missing_ranges(series_range(cell), start_d, end_d)
+        for c in _year_chunks(gs, ge)
+    ]
+    futures = {
+        _chunk_executor.submit(_fetch_daily_tmin, lat, lon, cs, ce): (cs, ce)
+        for cs, ce in chunks
+    }
+    # a failed chunk raises before anything is stored, so the stored range
+    # never spans a gap that later calls would not fetch again
+    fetched = {futures[fut]: fut.result() for fut in as_completed(futures)}
+    if fetched:
+        days, vals = [], []
+        for chunk in sorted(fetched):
+            days += fetched[chunk][0]
+            vals += fetched[chunk][1]
+        series_put(cell, lat, lon, days, vals, min(fetched)[0].toordinal())
+    return series_values(cell, start_d.toordinal(), end_d.toordinal())
+
+
+def _streamed_values(lat: float, lon: float, start_d: date, end_d: date):
+    futures = [
+        _chunk_executor.submit(_fetch_daily_tmin, lat, lon, cs, ce)
+        for cs, ce in _year_chunks(start_d, end_d)
+    ]
+    for fut in as_completed(futures):
+        yield fut.result()[1]
+
+
+def archive_tmin_percentile(
+    lat: float,
+    lon: float,
+    years: int = 10,
+    percentile: float = 0.01,
+    refresh: bool = False,
+) -> Tuple[Optional[float], bool]:
+    """
+    Raw (unfloored) Tmin percentile from the archive API, via the disk cache.
+    refresh=True skips the percentile cache but still reuses stored days.
+    Returns: (value or None, served_from_cache)
+    """
+    key = tmin_key(lat, lon, years, percentile)
+    if not refresh:
+        cached = cache_get(key)
+        if cached is not None:
+            return cached, True
+
+    end_d = date.today()
+    start_d = end_d - timedelta(days=365 * years)
+
+    sketch = HistogramSketch()
+    try:
+        sketch.add(_window_values(lat, lon, start_d, end_d))
+    except sqlite3.Error:
+        # local store unavailable: fold each year in as it arrives
+        for vals in _streamed_values(lat, lon, start_d, end_d):
+            sketch.add(vals)
+
+    if not sketch.n:
+        return None, False
+
+    p = sketch.quantile(percentile)
+    cache_put(key, p)
+    return p, False
 
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    data = r.json()
 
-    daily = data.get("daily", {})
-    vals = daily.get("temperature_2m_min", []) or []
-    vals = [v for v in vals if v is not None]
+def refresh_stored_sites(years: int = 10, percentile: float = 0.01) -> int:
+    """Nightly revalidation: top up each stored site with days since its last fetch."""
+    n = 0
+    for _, lat, lon in series_sites():
+        archive_tmin_percentile(lat, lon, years, percentile, refresh=True)
+        n += 1
+    return n
 
-    if not vals:
+
+def _neighbour_sites(
+    lat: float,
+    lon: float,
+    years: int,
+    percentile: float,
+    radius_km: float,
+    elev_tol_m: float,
+) -> List[Dict]:
+    """Resolved sites within radius_km and elev_tol_m, nearest first."""
+    try:
+        candidates = site_neighbours(lat, lon, years, percentile, radius_km)
+    except sqlite3.Error:
+        return []
+    candidates = [c for c in candidates if c["elevation"] is not None]
+    if not candidates:
+        return []
+    try:
+        elev = fetch_elevation(round(lat, 4), round(lon, 4))
+    except Exception:
+        return []
+    if elev is None:
+        return []
+    return [
+        dict(c, elevation_delta_m=c["elevation"] - elev)
+        for c in candidates
+        if abs(c["elevation"] - elev) <= elev_tol_m
+    ]
+
+
+def _neighbour_tmin(
+    lat: float,
+    lon: float,
+    years: int,
+    percentile: float,
+    radius_km: float,
+    elev_tol_m: float,
+) -> Optional[Dict]:
+    sites = _neighbour_sites(lat, lon, years, percentile, radius_km, elev_tol_m)
+    return sites[0] if sites else None
+
+
+def _record_site(lat: float, lon: float, years: int, percentile: float, p: float):
+    try:
+        elev = fetch_elevation(round(lat, 4), round(lon, 4))
+    except Exception:
+        elev = None
+    try:
+        site_put(lat, lon, elev, years, percentile, p)
+    except sqlite3.Error:
+        pass
+
+
+def fetch_design_tmin(
+    lat: float,
+    lon: float,
+    years: int = 10,
+    percentile: float = 0.01,
+    radius_km: float = NEIGHBOUR_RADIUS_KM,
+    elev_tol_m: float = NEIGHBOUR_ELEV_TOL_M,
+):
+    """
+    Design Tmin, cheapest source first: offline grid (offline mode only),
+    same-cell cache, a resolved neighbour within radius_km / elev_tol_m
+    (radius_km=0 disables), then the archive API.
+    """
+    label = _tmin_label(years, percentile)
+
+    if offline_mode():
+        from core.climate_grid import grid_lookup
+
+        p = grid_lookup(lat, lon, years=years, percentile=percentile)
+        if p is None:
+            return None, "Offline grid: site not covered"
+        return math.floor(p), f"Offline grid: {label}"
+
+    cached = cache_get(tmin_key(lat, lon, years, percentile))
+    if cached is not None:
+        return math.floor(cached), f"Archive: {label} · cached"
+
+    if radius_km > 0:
+        nb = _neighbour_tmin(lat, lon, years, percentile, radius_km, elev_tol_m)
+        if nb is not None:
+            return math.floor(nb["value"]), (
+                f"Neighbour: {label}, site {nb['distance_km']:.1f} km away "
+                f"(Δelev {nb['elevation_delta_m']:+.0f} m)"
+            )
+
+    p, _ = archive_tmin_percentile(lat, lon, years, percentile, refresh=True)
+    if p is None:
         return None, "Archive: no Tmin data"
+    _record_site(lat, lon, years, percentile, p)
+    return math.floor(p), f"Archive: {label}"
+
+
+def _profile_key(lat: float, lon: float, years: int) -> str:
+    return f"{cell_id(lat, lon)}|{int(years)}y|profile"
+
+
+def _store_profile_days(lat: float, lon: float, start_d: date, chunks: List[Dict]):
+    """Feed the profile's daily Tmin into the daily store used for design Tmin."""
+    days, vals = [], []
+    for data in chunks:
+        daily = data.get("daily", {}) or {}
+        days += [date.fromisoformat(t).toordinal() for t in daily.get("time", []) or []]
+        vals += daily.get("temperature_2m_min", []) or []
+    try:
+        series_put(cell_id(lat, lon), lat, lon, days, vals, start_d.toordinal())
+    except sqlite3.Error:
+        pass
+
+
+def fetch_site_climate_profile(
+    lat: float,
+    lon: float,
+    years: int = 10,
+    radius_km: float = NEIGHBOUR_RADIUS_KM,
+    elev_tol_m: float = NEIGHBOUR_ELEV_TOL_M,
+) -> Optional[SiteClimateProfile]:
+    """
+    Daily Tmin/Tmax and hourly temperature/irradiance in one combined request
+    per year chunk (chunks in parallel), summarized into a SiteClimateProfile.
+    Cached per grid cell as a compressed blob; a resolved neighbour's profile
+    (same radius / elevation rule as design Tmin) is reused before
+    downloading. Downloaded daily Tmin also goes to the daily store.
+    """
+    if offline_mode():
+        return None
+
+    key = _profile_key(lat, lon, years)
+    blob = blob_get(key)
+    if blob is not None:
+        return SiteClimateProfile.from_bytes(blob)
+    if radius_km > 0:
+        for nb in _neighbour_sites(lat, lon, years, 0.01, radius_km, elev_tol_m):
+            blob = blob_get(_profile_key(nb["lat"], nb["lon"], years))
+            if blob is not None:
+                return SiteClimateProfile.from_bytes(blob)
+
+    start_d, end_d = profile_window(years)
+    futures = [
+        _chunk_executor.submit(
+            get_json, "archive", ARCHIVE_URL, profile_request_params(lat, lon, cs, ce)
+        )
+        for cs, ce in _year_chunks(start_d, end_d)
+    ]
+    # keep date order: the hourly series is consumed as one contiguous array
+    chunks = [f.result() for f in futures]
+    prof = build_profile(lat, lon, years, start_d, end_d, chunks)
+    if not prof.days:
+        return None
+    _store_profile_days(lat, lon, start_d, chunks)
+    blob_put(key, prof.to_bytes())
+    return prof
+
+
+def _current_temp_update(lat: float, lon: float) -> Dict:
+    try:
+        return {"current_temp": fetch_current_temp(lat, lon)}
+    except Exception:
+        return {"current_temp": None}
+
+
+def _design_tmin_update(lat: float, lon: float, years: int) -> Dict:
+    try:
+        tmin, method = fetch_design_tmin(lat, lon, years=years)
+        return {"tmin": tmin, "tmin_method": method}
+    except Exception:
+        return {"tmin": None, "tmin_method": "Archive: failed to derive Tmin"}
+
+
+def _profile_update(lat: float, lon: float, years: int) -> Dict:
+    try:
+        return {"climate_profile": fetch_site_climate_profile(lat, lon, years)}
+    except Exception:
+        return {"climate_profile": None}
+
+
+def resolve_site_climate(lat: float, lon: float, years: int = 10) -> Iterator[Dict]:
+    """
+    Run the current-temperature, design-Tmin and climate-profile lookups
+    concurrently. Design Tmin takes the cheap chain (cache, neighbour, daily
+    store) and never waits for the much larger profile download; both reuse
+    neighbours and share the daily store. Yields session-state updates in
+    completion order, e.g.
+      {"current_temp": 31.2}
+      {"tmin": 4, "tmin_method": "Neighbour: ..."}
+      {"climate_profile": SiteClimateProfile(...)}
+    Failures are folded into the update, never raised.
+    """
+    futures = [
+        _executor.submit(_current_temp_update, lat, lon),
+        _executor.submit(_design_tmin_update, lat, lon, years),
+        _executor.submit(_profile_update, lat, lon, years),
+    ]
+    for fut in as_completed(futures):
+        yield fut.result()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SANAD climate maintenance.")
+    ap.add_argument(
+        "--refresh",
+        action="store_true",
+        help="fetch new archive days for every stored site and update Tmin",
+    )
+    ap.add_argument("--years", type=int, default=design_years())
+    ap.add_argument("--percentile", type=float, default=0.01)
+    args = ap.parse_args(argv)
+
+    if args.refresh:
+        n = refresh_stored_sites(args.years, args.percentile)
+        print(f"Refreshed {n} site(s).")
+    else:
+        ap.print_help()
+
 
-    s = pd.Series(vals, dtype="float64")
-    p01 = float(s.quantile(0.01))
-    return math.floor(p01), f"Archive: {years}y Tmin (1st percentile, floored)"
+if __name__ == "__main__":
+    main()
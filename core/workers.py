@@ -0,0 +1,39 @@
+"""
+Shared worker process pool for CPU-bound parsing (BoM sheets, PDF pages).
+
+Uses forkserver: Streamlit is multi-threaded (plain fork is unsafe) and
+spawn would re-run the app script in every worker. Where forkserver is
+unavailable, or on a single core, callers run in process instead. A pool
+broken by a crashed worker is dropped and rebuilt on the next call.
+"""
+
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+WORKERS = min(8, os.cpu_count() or 1)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def process_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if WORKERS == 1 or "forkserver" not in mp.get_all_start_methods():
+        return None
+    with _pool_lock:
+        if _pool is None:
+            ctx = mp.get_context("forkserver")
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=ctx)
+        return _pool
+
+
+def reset_pool(pool: ProcessPoolExecutor):
+    """Forget a pool that raised BrokenProcessPool; the next call builds anew."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,27 @@
+import pytest
+
+from core.catalog import import_csv, lookup_module
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setenv("SANAD_CATALOG_DB", str(tmp_path / "catalog.sqlite3"))
+    csv_path = tmp_path / "modules.csv"
+    rows = ["JKM580N-72HL4-V", "JKM585N-72HL4-V", "LR5-72HPH-550M-B1234"]
+    rows += [f"LR5-72HPH-{p}M-B{n}" for p in (540, 545) for n in range(1000, 1100)]
+    csv_path.write_text(
+        "model,voc_stc,temp_coeff_voc\n" + "".join(f"{m},49.5,-0.0029\n" for m in rows)
+    )
+    import_csv("modules", str(csv_path))
+
+
+def test_fuzzy_lookup_finds_one_character_typo(catalog):
+    rec = lookup_module("LR5-72HPH-550M-B123Q")
+    assert rec["model"] == "LR5-72HPH-550M-B1234"
+    assert rec["match"] == "fuzzy"
+    assert lookup_module("LR5-72HPH-550M-B123Q") == rec
+
+
+def test_fuzzy_lookup_keeps_power_class(catalog):
+    assert lookup_module("JKM580N-72HL4-V ")["model"] == "JKM580N-72HL4-V"
+    assert lookup_module("JKM590N-72HL4-V") is None
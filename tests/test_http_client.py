@@ -0,0 +1,40 @@
+from unittest import mock
+
+import pytest
+import requests
+
+from core import http_client
+
+
+def _response(status, body=b"{}"):
+    r = requests.Response()
+    r.status_code, r._content, r.raw = status, body, None
+    return r
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers():
+    http_client._breakers.clear()
+    yield
+    http_client._breakers.clear()
+
+
+def _get(response):
+    session = mock.Mock()
+    session.get.return_value = response
+    with mock.patch.object(http_client, "get_session", return_value=session):
+        with pytest.raises(requests.RequestException):
+            http_client.get_json("archive", "https://example.invalid", {})
+
+
+def test_client_errors_do_not_open_breaker():
+    for _ in range(http_client.BREAKER_THRESHOLD + 1):
+        _get(_response(400))
+        _get(_response(200, b"not json"))
+    assert not http_client.http_metrics()["archive"]["circuit_open"]
+
+
+def test_server_errors_open_breaker():
+    for _ in range(http_client.BREAKER_THRESHOLD):
+        _get(_response(503))
+    assert http_client.http_metrics()["archive"]["circuit_open"]
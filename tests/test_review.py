@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from core.review import (
+    batch_climate_voltage_check,
+    climate_voltage_check,
+    extract_bom_strings,
+)
+
+
+def _bom():
+    return pd.DataFrame(
+        {
+            "Inverter": ["Inv A", "Inv B", "Inv B", "Inv C"],
+            "Voc (V)": [49.5, 49.5, 52.0, 41.2],
+            "Temp coeff Voc": [-0.0029, -0.0029, -0.0027, -0.0031],
+            "Modules per string": [22, 28, 24, 30],
+            "Inverter max DC voltage": [1100, 1500, 1500, 1000],
+        }
+    )
+
+
+@pytest.mark.parametrize("tmin", [-10.0, 0.0, 5.5])
+def test_batch_matches_scalar_check(tmin):
+    strings = batch_climate_voltage_check(extract_bom_strings(_bom()), tmin)
+    assert len(strings) == 4
+    for row in strings.to_dict("records"):
+        status, numbers, recs = climate_voltage_check(row, tmin)
+        assert row["status"] == status.level
+        assert row["voc_cold_V"] == pytest.approx(numbers["Voc_cold_per_module_V"])
+        assert row["string_voc_V"] == pytest.approx(numbers["String_Voc_at_Tmin_V"])
+        if status.level == "FAIL":
+            assert f"to {row['safe_modules_per_string']} to" in recs[0]
+        else:
+            assert row["safe_modules_per_string"] == row["modules_per_string"]
+
+
+def test_rejected_modules_per_string_keeps_row():
+    bom = _bom().astype({"Modules per string": object})
+    bom.loc[1, "Modules per string"] = "abc"
+    bom.loc[2, "Modules per string"] = 500
+    strings = batch_climate_voltage_check(extract_bom_strings(bom), -5.0)
+    assert list(strings["row"]) == [0, 1, 2, 3]
+    assert list(strings["status"][1:3]) == ["UNKNOWN", "UNKNOWN"]
+    assert "UNKNOWN" not in set(strings["status"][[0, 3]])
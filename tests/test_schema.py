@@ -0,0 +1,27 @@
+import pytest
+
+from core.schema import resolve_columns
+
+
+@pytest.mark.parametrize(
+    "header, field",
+    [
+        ("Inverter Min DC Voltage", "inverter_vmax"),
+        ("Max AC voltage", "inverter_vmax"),
+        ("Vmp temperature coefficient", "temp_coeff"),
+    ],
+)
+def test_fuzzy_match_never_crosses_qualifiers(header, field):
+    assert resolve_columns([header, "Voc"])[field] is None
+
+
+@pytest.mark.parametrize(
+    "header, field",
+    [
+        ("Inverter Max DC Voltage ", "inverter_vmax"),
+        ("Max. DC-voltage (V)", "inverter_vmax"),
+        ("Temperatur coefficient", "temp_coeff"),
+    ],
+)
+def test_fuzzy_match_keeps_near_typos(header, field):
+    assert resolve_columns([header, "Voc"])[field] == header
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from core.catalog import import_csv
+from core.sizing import tables_from_strings
+
+
+def test_inverter_table_includes_catalog(tmp_path, monkeypatch):
+    monkeypatch.setenv("SANAD_CATALOG_DB", str(tmp_path / "catalog.sqlite3"))
+    csv_path = tmp_path / "inverters.csv"
+    csv_path.write_text(
+        "model,manufacturer,vdc_max,mppt_vmin,mppt_vmax,mppt_count,idc_max\n"
+        "SG250,Sungrow,1500,500,1500,12,30\n"
+        "SUN2000-330KTL,Huawei,1500,550,1500,6,30\n"
+        "No Rating,Foo,,,,,\n"
+    )
+    import_csv("inverters", str(csv_path))
+    strings = pd.DataFrame(
+        {
+            "inverter_name": ["SG250", "SG110"],
+            "voc_stc": [49.5, 49.5],
+            "temp_coeff": [-0.0029, -0.0029],
+            "inverter_vmax": [1500.0, 1100.0],
+        }
+    )
+    _, invs = tables_from_strings(strings)
+    assert list(invs["model"]) == ["SG250", "SG110", "SUN2000-330KTL"]
+    assert list(invs["mppt_vmin"].fillna(0)) == [500.0, 0, 550.0]